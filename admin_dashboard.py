@@ -1,308 +1,600 @@
-import streamlit as st
-from database import Database
-import pandas as pd
-import time
-
-def admin_dashboard():
-    """Panel de administrador"""
-    st.markdown("### 👑 Panel Administrador")
-    
-    if 'user' not in st.session_state or st.session_state['user']['role'] != 'admin':
-        st.error("❌ Acceso denegado")
-        return
-    
-    db = Database()
-    user = st.session_state['user']
-    
-    # Sidebar Admin
-    with st.sidebar:
-        st.markdown(f"**👑 Admin:** {user['nombre']}")
-        st.divider()
-        
-        menu = st.radio("Gestión", 
-                       ["📊 Dashboard", "🏢 Gestionar Ofertas", 
-                        "📋 Revisar Postulaciones", "👥 Usuarios"])
-    
-    if menu == "📊 Dashboard":
-        dashboard_admin(db)
-    elif menu == "🏢 Gestionar Ofertas":
-        gestionar_ofertas(db)
-    elif menu == "📋 Revisar Postulaciones":
-        revisar_postulaciones(db)
-    else:
-        gestionar_usuarios(db)
-
-def dashboard_admin(db):
-    """Dashboard principal con estadísticas"""
-    st.markdown("#### 📊 Dashboard General")
-    
-    # Estadísticas corregidas
-    try:
-        # Contar ofertas
-        ofertas_resp = db.sb.table("ofertas_practicas").select("*", count="exact").execute()
-        total_ofertas = getattr(ofertas_resp, 'count', 0) or 0
-
-        # Contar postulaciones
-        postulaciones_resp = db.sb.table("postulaciones").select("*", count="exact").execute()
-        total_postulaciones = getattr(postulaciones_resp, 'count', 0) or 0
-
-        # Contar pendientes
-        pendientes_resp = db.sb.table("postulaciones")\
-            .select("*", count="exact")\
-            .eq("estado", "pendiente")\
-            .execute()
-        postulaciones_pendientes = getattr(pendientes_resp, 'count', 0) or 0
-
-        stats = {
-            "total_ofertas": total_ofertas,
-            "total_postulaciones": total_postulaciones,
-            "pendientes": postulaciones_pendientes
-        }
-    except:
-        stats = {"total_ofertas": 0, "total_postulaciones": 0, "pendientes": 0}
-    
-    col1, col2, col3 = st.columns(3)
-    with col1:
-        st.metric("📌 Ofertas Activas", stats['total_ofertas'])
-    with col2:
-        st.metric("📬 Postulaciones", stats['total_postulaciones'])
-    with col3:
-        st.metric("⏳ Pendientes", stats['pendientes'])
-    
-    st.divider()
-    st.markdown("#### 📈 Visualización")
-    st.info("💡 En un sistema completo, aquí irían gráficos con Plotly")
-
-def gestionar_ofertas(db):
-    """CRUD completo de ofertas"""
-    st.markdown("#### 🏢 Gestión de Ofertas de Prácticas")
-    
-    tab1, tab2, tab3 = st.tabs(["➕ Crear Oferta", "📋 Listar Ofertas", "✏️ Editar/Eliminar"])
-    
-    with tab1:
-        crear_oferta_form(db)
-    
-    with tab2:
-        listar_ofertas_admin(db)
-    
-    with tab3:
-        editar_oferta_form(db)
-
-def crear_oferta_form(db):
-    """Formulario para crear oferta"""
-    st.markdown("**Nueva Oferta de Práctica**")
-    
-    with st.form("nueva_oferta", clear_on_submit=True):
-        col1, col2 = st.columns(2)
-        with col1:
-            titulo = st.text_input("Título del puesto *", placeholder="Desarrollador Frontend")
-            empresa = st.text_input("Empresa *", placeholder="Tech Solutions SAC")
-            area = st.selectbox("Área *", 
-                ["Tecnología", "Administración", "Marketing", "Recursos Humanos", 
-                 "Finanzas", "Diseño", "Ingeniería", "Otro"])
-        
-        with col2:
-            duracion = st.text_input("Duración *", placeholder="6 meses")
-            modalidad = st.selectbox("Modalidad *", ["Presencial", "Remoto", "Híbrido"])
-            ubicacion = st.text_input("Ubicación *", placeholder="Lima, Perú")
-        
-        descripcion = st.text_area("Descripción *", height=150)
-        requisitos = st.text_area("Requisitos *", height=150)
-        
-        if st.form_submit_button("Publicar Oferta", type="primary"):
-            if not all([titulo, empresa, area, duracion, modalidad, ubicacion]):
-                st.error("❌ Completa todos los campos obligatorios")
-                return
-            
-            datos = {
-                "titulo": titulo,
-                "empresa": empresa,
-                "area": area,
-                "duracion": duracion,
-                "modalidad": modalidad,
-                "ubicacion": ubicacion,
-                "descripcion": descripcion,
-                "requisitos": requisitos,
-                "estado": "activa"
-            }
-            
-            try:
-                db.crear_oferta(datos)
-                st.success("✅ Oferta creada exitosamente")
-                st.balloons()
-            except Exception as e:
-                st.error(f"❌ Error: {e}")
-
-def listar_ofertas_admin(db):
-    """Listar todas las ofertas"""
-    ofertas = db.obtener_ofertas()
-    
-    if not ofertas.data:
-        st.info("No hay ofertas registradas")
-        return
-    
-    for oferta in ofertas.data:
-        with st.expander(f"🏢 {oferta['titulo']} - {oferta['empresa']}"):
-            st.markdown(f"**Área:** {oferta['area']} | **Modalidad:** {oferta['modalidad']}")
-            st.markdown(f"**Estado:** `{oferta['estado']}`")
-            st.markdown(f"**Descripción:** {oferta['descripcion']}")
-
-def editar_oferta_form(db):
-    """Editar o eliminar oferta"""
-    oferta_id = st.text_input("ID de la oferta a editar/eliminar", 
-                              help="Obtén el ID de la tabla de ofertas")
-    
-    if oferta_id:
-        oferta = db.obtener_oferta_por_id(oferta_id)
-        
-        if oferta.data:
-            oferta = oferta.data[0]
-            st.markdown(f"Editando: **{oferta['titulo']}**")
-            
-            # Similar a crear_oferta_form pero con datos prellenados
-            # (simplificado por brevedad)
-            st.info("Formulario de edición aquí (similar a crear)")
-            
-            if st.button("🗑️ Eliminar Oferta", type="secondary"):
-                if st.checkbox("⚠️ Confirmar eliminación"):
-                    db.eliminar_oferta(oferta_id)
-                    st.success("✅ Oferta eliminada")
-        else:
-            st.error("❌ Oferta no encontrada")
-
-def revisar_postulaciones(db):
-    """Revisar y aprobar/rechazar postulaciones con opciones de editar/eliminar"""
-    st.markdown("#### 📋 Revisión de Postulaciones")
-    
-    # Filtros
-    col_filter1, col_filter2 = st.columns(2)
-    with col_filter1:
-        estado_filtro = st.selectbox("Filtrar por estado", 
-            ["Todos", "pendiente", "aprobado", "rechazado"])
-    
-    postulaciones = db.obtener_postulaciones_admin()
-    
-    if not postulaciones.data:
-        st.info("📭 No hay postulaciones para revisar")
-        return
-    
-    # Mostrar contador
-    total = len(postulaciones.data)
-    pendientes = len([p for p in postulaciones.data if p['estado'] == 'pendiente'])
-    st.markdown(f"**Total:** `{total}` | **Pendientes:** `{pendientes}`")
-    
-    for post in postulaciones.data:
-        if estado_filtro != "Todos" and post['estado'] != estado_filtro:
-            continue
-        
-        with st.container():
-            # Tarjeta de postulación
-            estudiante = post['users']
-            oferta = post['ofertas_practicas']
-            
-            st.markdown(f"### 📄 **{oferta['titulo']}**")
-            st.markdown(f"**👤 Estudiante:** {estudiante['nombre']} {estudiante['apellido']} | 📧 {estudiante['email']}")
-            st.markdown(f"**🏢 Empresa:** {oferta['empresa']} | 📍 {oferta['ubicacion']}")
-            
-            # Mostrar notas si existen
-            if post.get('notas'):
-                st.markdown(f"**📝 Notas:** {post['notas']}")
-            
-            # Estado actual
-            estado = post['estado']
-            color = "green" if estado == "aprobado" else "orange" if estado == "pendiente" else "red"
-            st.markdown(f"**Estado actual:** :{color}[**{estado.upper()}**] | 📅 {post['fecha_postulacion'][:10]}")
-            
-            # ACCIONES DEL ADMIN - INCLUYE EDITAR/ELIMINAR
-            col_acc1, col_acc2, col_acc3, col_acc4 = st.columns([1, 1, 1, 3])
-            with col_acc1:
-                if st.button("✅ Aprobar", key=f"apr_{post['id']}", type="primary"):
-                    db.actualizar_estado_postulacion(post['id'], 'aprobado')
-                    st.success(f"✅ Postulación aprobada para {estudiante['nombre']}")
-                    time.sleep(1)
-                    st.rerun()
-            
-            with col_acc2:
-                if st.button("❌ Rechazar", key=f"rec_{post['id']}", type="secondary"):
-                    db.actualizar_estado_postulacion(post['id'], 'rechazado')
-                    st.error(f"❌ Postulación rechazada para {estudiante['nombre']}")
-                    time.sleep(1)
-                    st.rerun()
-            
-            with col_acc3:
-                if st.button("✏️ Editar", key=f"edit_{post['id']}"):
-                    editar_postulacion_admin(db, post['id'], oferta['titulo'])
-            
-            with col_acc4:
-                if st.button("🗑️ Eliminar", key=f"del_{post['id']}", type="secondary"):
-                    eliminar_postulacion_admin(db, post['id'], oferta['titulo'])
-            
-            st.divider()
-
-def editar_postulacion_admin(db, postulacion_id, titulo_oferta):
-    """Admin puede editar notas de cualquier postulación"""
-    st.markdown(f"**✏️ Editando postulación:** {titulo_oferta}")
-    
-    # Obtener datos actuales
-    postulacion = db.obtener_postulacion_por_id(postulacion_id)
-    if not postulacion.data:
-        st.error("No se pudo cargar la postulación")
-        return
-    
-    datos_actuales = postulacion.data[0]
-    
-    # Formulario de edición
-    with st.form(key=f"edit_form_admin_{postulacion_id}"):
-        notas = st.text_area(
-            "Notas adicionales (para uso interno del admin)",
-            value=datos_actuales.get('notas', ''),
-            help="Estas notas solo las ve el administrador"
-        )
-        
-        col1, col2 = st.columns(2)
-        with col1:
-            if st.form_submit_button("💾 Guardar cambios", type="primary"):
-                try:
-                    db.actualizar_postulacion(postulacion_id, {"notas": notas})
-                    st.success("✅ Postulación actualizada por admin")
-                    time.sleep(1)
-                    st.rerun()
-                except Exception as e:
-                    st.error(f"❌ Error al actualizar: {e}")
-        
-        with col2:
-            if st.form_submit_button("❌ Cancelar", type="secondary"):
-                st.rerun()
-
-def eliminar_postulacion_admin(db, postulacion_id, titulo_oferta):
-    """Admin puede eliminar cualquier postulación"""
-    st.markdown(f"**⚠️ ¿Eliminar postulación?** {titulo_oferta}")
-    st.warning("⚠️ **ADVERTENCIA:** Esta acción eliminará la postulación completamente")
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        if st.button("✅ Confirmar eliminación", key=f"conf_del_admin_{postulacion_id}", type="primary"):
-            try:
-                db.eliminar_postulacion(postulacion_id)
-                st.success("🗑️ Postulación eliminada por admin")
-                time.sleep(1)
-                st.rerun()
-            except Exception as e:
-                st.error(f"❌ Error al eliminar: {e}")
-    
-    with col2:
-        if st.button("❌ Cancelar", key=f"cancel_del_admin_{postulacion_id}"):
-            st.rerun()
-
-def gestionar_usuarios(db):
-    """Gestión básica de usuarios"""
-    st.markdown("#### 👥 Gestión de Usuarios")
-    
-    # Solo para demostración
-    st.info("💡 En un sistema completo, aquí se gestionarían usuarios")
-    
-    if st.checkbox("Mostrar todos los usuarios (solo admin)"):
-        users = db.sb.table("users").select("id, nombre, apellido, email, role, created_at").execute()
-        if users.data:
-            df = pd.DataFrame(users.data)
+import streamlit as st
+from database import Database, TAMANO_PAGINA, cache_ofertas
+from paginacion import cursor_actual, controles_paginacion
+from config import estadisticas_pool, verificar_conexion
+from throttle import metricas_login
+from resiliencia import circuito
+from instrumentacion import reportar
+from config import PRESUPUESTO_CONSULTAS, EXPORTACION_MAX_FILAS
+import copy
+import os
+
+def admin_dashboard():
+    """Panel de administrador"""
+    st.markdown("### 👑 Panel Administrador")
+    
+    if 'user' not in st.session_state or st.session_state['user']['role'] != 'admin':
+        st.error("❌ Acceso denegado")
+        return
+    
+    db = Database()
+    user = st.session_state['user']
+    
+    # Sidebar Admin
+    with st.sidebar:
+        st.markdown(f"**👑 Admin:** {user['nombre']}")
+        st.divider()
+        
+        menu = st.radio("Gestión", 
+                       ["📊 Dashboard", "🏢 Gestionar Ofertas", 
+                        "📋 Revisar Postulaciones", "📤 Exportar", "👥 Usuarios"])
+    
+    if menu == "📊 Dashboard":
+        dashboard_admin(db)
+    elif menu == "🏢 Gestionar Ofertas":
+        gestionar_ofertas(db)
+    elif menu == "📋 Revisar Postulaciones":
+        revisar_postulaciones(db)
+    elif menu == "📤 Exportar":
+        exportar_postulaciones_admin(db)
+    else:
+        gestionar_usuarios(db)
+    
+    panel_consultas(db, menu)
+
+def panel_consultas(db, pagina):
+    """Panel de depuración: consultas de este rerun, con tiempos, filas y tamaño"""
+    totales = reportar(db.registro, f"admin/{pagina}")
+    with st.expander(f"🐞 Consultas de este rerun ({totales['consultas']})"):
+        if db.registro.excede_presupuesto():
+            st.warning(f"⚠️ Esta página hizo {totales['consultas']} consultas "
+                       f"(presupuesto: {PRESUPUESTO_CONSULTAS})")
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Consultas", totales['consultas'])
+        col2.metric("Tiempo total", f"{totales['milisegundos']:.0f} ms")
+        col3.metric("Filas", totales['filas'])
+        col4.metric("Transferido", f"{totales['bytes'] / 1024:.1f} KiB")
+        if db.registro.consultas:
+            import pandas as pd
+            df = pd.DataFrame(db.registro.consultas)
+            df['filtros'] = df['filtros'].str.join(", ")
+            st.dataframe(df, use_container_width=True, hide_index=True)
+
+def dashboard_admin(db):
+    """Dashboard principal con estadísticas"""
+    st.markdown("#### 📊 Dashboard General")
+    
+    # Estadísticas (una sola consulta, compartida entre sesiones admin)
+    try:
+        stats = db.get_estadisticas()
+    except Exception as e:
+        # Sin datos se muestra "—", nunca ceros que parezcan reales
+        st.error(f"❌ No se pudieron cargar las estadísticas: {e}")
+        stats = {"total_ofertas": "—", "total_postulaciones": "—", "pendientes": "—"}
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📌 Ofertas Activas", stats['total_ofertas'])
+    with col2:
+        st.metric("📬 Postulaciones", stats['total_postulaciones'])
+    with col3:
+        st.metric("⏳ Pendientes", stats['pendientes'])
+    
+    st.divider()
+    st.markdown("#### 📈 Visualización")
+    from analitica import obtener_analitica
+    try:
+        analitica = obtener_analitica(db)
+    except Exception as e:
+        st.error(f"❌ No se pudo cargar la analítica: {e}")
+        analitica = None
+    
+    if analitica:
+        st.markdown("**Postulaciones por semana**")
+        st.line_chart(analitica['por_semana'])
+        
+        tab_area, tab_empresa, tab_modalidad, tab_oferta = st.tabs(
+            ["Por área", "Por empresa", "Por modalidad", "Por oferta"])
+        with tab_area:
+            st.bar_chart(analitica['por_area'][["aprobadas", "rechazadas", "pendientes"]])
+        with tab_empresa:
+            st.bar_chart(analitica['por_empresa'][["aprobadas", "rechazadas", "pendientes"]].head(20))
+        with tab_modalidad:
+            st.bar_chart(analitica['por_modalidad'][["aprobadas", "rechazadas", "pendientes"]])
+        with tab_oferta:
+            st.dataframe(analitica['por_oferta'], use_container_width=True,
+                         column_config={"tasa_aprobacion": st.column_config.ProgressColumn(
+                             "Tasa de aprobación", min_value=0, max_value=1, format="%.2f")})
+
+    with st.expander("🔌 Conexión con Supabase"):
+        pool = estadisticas_pool()
+        st.markdown(f"**Pool:** `{pool['tamano_pool']}` conexiones | "
+                    f"**Peticiones:** `{pool['peticiones']}` | "
+                    f"**Reutilizadas:** `{pool['conexiones_reutilizadas']}` | "
+                    f"**Nuevas:** `{pool['conexiones_nuevas']}`")
+        catalogo = cache_ofertas.metricas()
+        st.markdown(f"**Cache de ofertas:** `{catalogo['entradas']}` entradas | "
+                    f"**Aciertos:** `{catalogo['aciertos']}` | **Fallos:** `{catalogo['fallos']}` | "
+                    f"**Tasa:** `{catalogo['tasa_aciertos']:.0%}`")
+        estado_circuito = circuito.estado()
+        st.markdown(f"**Circuito:** `{estado_circuito['estado']}` | "
+                    f"**Fallos seguidos:** `{estado_circuito['fallos_seguidos']}` | "
+                    f"**Llamadas rechazadas:** `{estado_circuito['rechazadas']}`")
+        login = metricas_login()
+        st.markdown(f"**Logins:** `{login['intentos']}` intentos | "
+                    f"**bcrypt ejecutados:** `{login['bcrypt_ejecutados']}` | "
+                    f"**bcrypt evitados:** `{login['bcrypt_evitados']}` "
+                    f"(`{login['rechazados_email'] + login['rechazados_sesion']}` por límite, "
+                    f"`{login['inexistentes_cache']}` emails inexistentes)")
+        if st.button("🩺 Verificar conexión"):
+            salud = verificar_conexion()
+            if salud['ok']:
+                st.success(f"✅ Supabase responde en {salud['latencia_ms']} ms")
+            else:
+                st.error(f"❌ Supabase no responde: {salud['error']}")
+
+def gestionar_ofertas(db):
+    """CRUD completo de ofertas"""
+    st.markdown("#### 🏢 Gestión de Ofertas de Prácticas")
+    
+    tab1, tab2, tab3, tab4 = st.tabs(["➕ Crear Oferta", "📋 Listar Ofertas", "✏️ Editar/Eliminar",
+                                      "📥 Importar"])
+    
+    with tab1:
+        crear_oferta_form(db)
+    
+    with tab2:
+        listar_ofertas_admin(db)
+    
+    with tab3:
+        editar_oferta_form(db)
+    
+    with tab4:
+        importar_ofertas_form(db)
+
+def importar_ofertas_form(db):
+    """Carga masiva de ofertas desde CSV, JSON o JSON Lines"""
+    from importar_ofertas import importar_ofertas, formato_de, COLUMNAS
+    
+    st.markdown("**Importar ofertas desde archivo**")
+    st.caption(f"Columnas aceptadas: {', '.join(COLUMNAS)}. Obligatorias: titulo, empresa, area.")
+    
+    archivo = st.file_uploader("Archivo de ofertas", type=["csv", "json", "jsonl"], key="archivo_ofertas")
+    tamano_lote = st.number_input("Filas por lote", min_value=10, max_value=1000, value=100, step=10)
+    if not archivo:
+        return
+    
+    # Progreso por archivo: si una importación se interrumpe, se ofrece reanudarla
+    clave = f"importacion_{archivo.name}_{archivo.size}"
+    desde = st.session_state.get(clave, 0)
+    if desde:
+        st.warning(f"⚠️ La importación anterior se detuvo en la fila {desde}")
+    
+    if st.button("📥 Reanudar importación" if desde else "📥 Importar", type="primary"):
+        progreso = st.empty()
+        archivo.seek(0)
+        try:
+            resumen = importar_ofertas(
+                db, archivo, formato_de(archivo.name), tamano_lote=int(tamano_lote), desde=desde,
+                al_avanzar=lambda r: progreso.info(
+                    f"⏳ {r.siguiente_fila} filas procesadas | {r.insertadas} insertadas | "
+                    f"{r.filas_por_segundo:.0f} filas/s"))
+        except Exception as e:
+            # Columnas obligatorias ausentes, archivo vacío o mal formado
+            progreso.empty()
+            st.error(f"❌ No se pudo leer el archivo: {e}")
+            return
+        
+        st.session_state[clave] = 0 if resumen.completa else resumen.siguiente_fila
+        progreso.empty()
+        if resumen.completa:
+            st.success(f"✅ {resumen.insertadas} ofertas importadas en {resumen.segundos:.1f} s "
+                       f"({resumen.filas_por_segundo:.0f} filas/s)")
+        else:
+            st.error(f"❌ Importación interrumpida en la fila {resumen.siguiente_fila}: {resumen.interrumpida}")
+        
+        if resumen.omitidas:
+            st.info(f"↪️ {resumen.omitidas} ofertas omitidas: ya se habían insertado antes de la interrupción")
+        
+        if resumen.errores:
+            st.markdown(f"**{len(resumen.errores)} filas con errores**")
+            import pandas as pd
+            st.dataframe(pd.DataFrame(resumen.errores, columns=["fila", "error"]), use_container_width=True)
+
+def crear_oferta_form(db):
+    """Formulario para crear oferta"""
+    st.markdown("**Nueva Oferta de Práctica**")
+    
+    with st.form("nueva_oferta", clear_on_submit=True):
+        col1, col2 = st.columns(2)
+        with col1:
+            titulo = st.text_input("Título del puesto *", placeholder="Desarrollador Frontend")
+            empresa = st.text_input("Empresa *", placeholder="Tech Solutions SAC")
+            area = st.selectbox("Área *", 
+                ["Tecnología", "Administración", "Marketing", "Recursos Humanos", 
+                 "Finanzas", "Diseño", "Ingeniería", "Otro"])
+        
+        with col2:
+            duracion = st.text_input("Duración *", placeholder="6 meses")
+            modalidad = st.selectbox("Modalidad *", ["Presencial", "Remoto", "Híbrido"])
+            ubicacion = st.text_input("Ubicación *", placeholder="Lima, Perú")
+        
+        descripcion = st.text_area("Descripción *", height=150)
+        requisitos = st.text_area("Requisitos *", height=150)
+        
+        if st.form_submit_button("Publicar Oferta", type="primary"):
+            if not all([titulo, empresa, area, duracion, modalidad, ubicacion]):
+                st.error("❌ Completa todos los campos obligatorios")
+                return
+            
+            datos = {
+                "titulo": titulo,
+                "empresa": empresa,
+                "area": area,
+                "duracion": duracion,
+                "modalidad": modalidad,
+                "ubicacion": ubicacion,
+                "descripcion": descripcion,
+                "requisitos": requisitos,
+                "estado": "activa"
+            }
+            
+            try:
+                db.crear_oferta(datos)
+                st.success("✅ Oferta creada exitosamente")
+                st.balloons()
+            except Exception as e:
+                st.error(f"❌ Error: {e}")
+
+def listar_ofertas_admin(db):
+    """Listar todas las ofertas"""
+    ofertas = db.obtener_ofertas(limite=TAMANO_PAGINA, cursor=cursor_actual("ofertas_admin"),
+                                 perfil="tabla")
+    
+    if not ofertas.data:
+        st.info("No hay ofertas registradas")
+        return
+    
+    for oferta in ofertas.data:
+        with st.expander(f"🏢 {oferta['titulo']} - {oferta['empresa']}"):
+            st.markdown(f"**Área:** {oferta['area']} | **Modalidad:** {oferta['modalidad']}")
+            st.markdown(f"**Estado:** `{oferta['estado']}`")
+            if st.toggle("Ver descripción", key=f"desc_{oferta['id']}"):
+                detalle = db.obtener_oferta_por_id(oferta['id'])
+                if detalle.data:
+                    st.markdown(f"**Descripción:** {detalle.data[0]['descripcion']}")
+    
+    controles_paginacion("ofertas_admin", ofertas.siguiente)
+
+def editar_oferta_form(db):
+    """Editar o eliminar oferta"""
+    oferta_id = st.text_input("ID de la oferta a editar/eliminar", 
+                              help="Obtén el ID de la tabla de ofertas")
+    
+    if oferta_id:
+        oferta = db.obtener_oferta_por_id(oferta_id)
+        
+        if oferta.data:
+            oferta = oferta.data[0]
+            st.markdown(f"Editando: **{oferta['titulo']}**")
+            
+            # Similar a crear_oferta_form pero con datos prellenados
+            # (simplificado por brevedad)
+            st.info("Formulario de edición aquí (similar a crear)")
+            
+            if st.button("🗑️ Eliminar Oferta", type="secondary"):
+                if st.checkbox("⚠️ Confirmar eliminación"):
+                    db.eliminar_oferta(oferta_id)
+                    st.success("✅ Oferta eliminada")
+        else:
+            st.error("❌ Oferta no encontrada")
+
+def revisar_postulaciones(db):
+    """Revisar y aprobar/rechazar postulaciones con opciones de editar/eliminar"""
+    st.markdown("#### 📋 Revisión de Postulaciones")
+    
+    # Filtros
+    col_filter1, col_filter2 = st.columns(2)
+    with col_filter1:
+        estado_filtro = st.selectbox("Filtrar por estado", 
+            ["Todos", "pendiente", "aprobado", "rechazado"])
+    with col_filter2:
+        refrescar = st.button("🔄 Actualizar")
+    
+    estado = None if estado_filtro == "Todos" else estado_filtro
+    
+    cursor = cursor_actual("postulaciones_admin", firma=estado)
+    vista = _vista_postulaciones(db, estado, cursor, refrescar)
+    st.markdown(f"**Total:** `{vista['total']}` | **Pendientes:** `{vista['pendientes']}`")
+    
+    if 'aviso_admin' in st.session_state:
+        st.success(st.session_state.pop('aviso_admin'))
+    if 'error_admin' in st.session_state:
+        st.error(st.session_state.pop('error_admin'))
+    
+    if not vista['filas']:
+        st.info("📭 No hay postulaciones para revisar")
+        return
+    
+    ids_pagina = [post['id'] for post in vista['filas']]
+    st.checkbox("Seleccionar toda la página", key="sel_pagina",
+                on_change=_seleccionar_pagina, args=(ids_pagina,))
+    
+    for post in vista['filas']:
+        with st.container():
+            # Tarjeta de postulación
+            estudiante = post['users']
+            oferta = post['ofertas_practicas']
+            
+            st.checkbox("Seleccionar", key=f"sel_{post['id']}")
+            st.markdown(f"### 📄 **{oferta['titulo']}**")
+            st.markdown(f"**👤 Estudiante:** {estudiante['nombre']} {estudiante['apellido']} | 📧 {estudiante['email']}")
+            st.markdown(f"**🏢 Empresa:** {oferta['empresa']} | 📍 {oferta['ubicacion']}")
+            
+            # Mostrar notas si existen
+            if post.get('notas'):
+                st.markdown(f"**📝 Notas:** {post['notas']}")
+            
+            # Estado actual
+            estado = post['estado']
+            color = "green" if estado == "aprobado" else "orange" if estado == "pendiente" else "red"
+            st.markdown(f"**Estado actual:** :{color}[**{estado.upper()}**] | 📅 {post['fecha_postulacion'][:10]}")
+            
+            # ACCIONES DEL ADMIN - INCLUYE EDITAR/ELIMINAR
+            col_acc1, col_acc2, col_acc3, col_acc4 = st.columns([1, 1, 1, 3])
+            with col_acc1:
+                st.button("✅ Aprobar", key=f"apr_{post['id']}", type="primary",
+                          on_click=_cambiar_estado, args=(db, post['id'], 'aprobado', estudiante['nombre']))
+            
+            with col_acc2:
+                st.button("❌ Rechazar", key=f"rec_{post['id']}", type="secondary",
+                          on_click=_cambiar_estado, args=(db, post['id'], 'rechazado', estudiante['nombre']))
+            
+            with col_acc3:
+                st.button("✏️ Editar", key=f"edit_{post['id']}",
+                          on_click=_abrir_accion, args=('editando', post['id']))
+            
+            with col_acc4:
+                st.button("🗑️ Eliminar", key=f"del_{post['id']}", type="secondary",
+                          on_click=_abrir_accion, args=('eliminando', post['id']))
+            
+            if st.session_state.get('editando') == post['id']:
+                editar_postulacion_admin(db, post, oferta['titulo'])
+            if st.session_state.get('eliminando') == post['id']:
+                eliminar_postulacion_admin(db, post['id'], oferta['titulo'])
+            
+            st.divider()
+    
+    acciones_masivas(db, ids_pagina)
+    controles_paginacion("postulaciones_admin", vista['siguiente'])
+
+def _vista_postulaciones(db, estado, cursor, refrescar=False):
+    """Página y contadores en la sesión: al cambiar de filtro o página, o al actualizar, se sincroniza solo el delta"""
+    vista = st.session_state.get('vista_postulaciones')
+    if refrescar or vista is None or vista['clave'] != (estado, cursor):
+        instantanea = db.instantanea_al_dia()
+        if instantanea is None:
+            # La instantánea se está cargando en segundo plano: página y conteos desde el servidor
+            resultados = db.en_paralelo(
+                pagina=lambda: db.obtener_postulaciones_admin(estado=estado, limite=TAMANO_PAGINA, cursor=cursor),
+                total=lambda: db.contar_postulaciones(),
+                pendientes=lambda: db.contar_postulaciones("pendiente"))
+            pagina, total, pendientes = resultados['pagina'], resultados['total'], resultados['pendientes']
+        else:
+            pagina = instantanea.pagina(estado=estado, limite=TAMANO_PAGINA, cursor=cursor)
+            total, pendientes = instantanea.contar(), instantanea.contar("pendiente")
+        vista = {
+            "clave": (estado, cursor),
+            "total": total,
+            "pendientes": pendientes,
+            "filas": pagina.data,
+            "siguiente": pagina.siguiente
+        }
+        st.session_state['vista_postulaciones'] = vista
+    return vista
+
+def _parchear_vista(vista, ids, datos=None):
+    """Aplica un cambio a las filas locales (datos=None significa eliminación) y ajusta contadores"""
+    ids = set(ids)
+    filtro = vista['clave'][0]
+    filas = []
+    for fila in vista['filas']:
+        if fila['id'] not in ids:
+            filas.append(fila)
+            continue
+        
+        era_pendiente = fila['estado'] == 'pendiente'
+        if datos is None:
+            vista['total'] -= 1
+            vista['pendientes'] -= era_pendiente
+            continue
+        
+        fila.update(datos)
+        vista['pendientes'] += (fila['estado'] == 'pendiente') - era_pendiente
+        # Si ya no cumple el filtro de estado, sale de la vista
+        if not filtro or fila['estado'] == filtro:
+            filas.append(fila)
+    vista['filas'] = filas
+
+def _escribir_optimista(escritura, ids, datos=None, aviso=None):
+    """Refleja el cambio en la vista local y lo envía al servidor; si falla, restaura la vista"""
+    vista = st.session_state.get('vista_postulaciones')
+    respaldo = copy.deepcopy(vista)
+    if vista:
+        _parchear_vista(vista, ids, datos)
+    
+    try:
+        escritura()
+    except Exception as e:
+        st.session_state['vista_postulaciones'] = respaldo
+        st.session_state['error_admin'] = f"❌ No se pudo guardar el cambio: {e}"
+        return False
+    
+    if aviso:
+        st.session_state['aviso_admin'] = aviso
+    return True
+
+def _abrir_accion(accion, postulacion_id):
+    """Muestra el formulario de edición o la confirmación de borrado de una postulación"""
+    st.session_state.pop('editando', None)
+    st.session_state.pop('eliminando', None)
+    st.session_state[accion] = postulacion_id
+
+def _cambiar_estado(db, postulacion_id, nuevo_estado, nombre):
+    aviso = (f"✅ Postulación aprobada para {nombre}" if nuevo_estado == 'aprobado'
+             else f"❌ Postulación rechazada para {nombre}")
+    _escribir_optimista(lambda: db.actualizar_estado_postulacion(postulacion_id, nuevo_estado),
+                        [postulacion_id], {"estado": nuevo_estado}, aviso)
+
+def _guardar_notas(db, postulacion_id):
+    notas = st.session_state[f"notas_{postulacion_id}"]
+    if _escribir_optimista(lambda: db.actualizar_postulacion(postulacion_id, {"notas": notas}),
+                           [postulacion_id], {"notas": notas}, "✅ Postulación actualizada por admin"):
+        st.session_state.pop('editando', None)
+
+def _eliminar(db, postulacion_id):
+    if _escribir_optimista(lambda: db.eliminar_postulacion(postulacion_id),
+                           [postulacion_id], None, "🗑️ Postulación eliminada por admin"):
+        st.session_state.pop('eliminando', None)
+
+def _seleccionar_pagina(ids):
+    """Marca o desmarca todas las postulaciones de la página"""
+    for postulacion_id in ids:
+        st.session_state[f"sel_{postulacion_id}"] = st.session_state['sel_pagina']
+
+def _aplicar_masivo(db, ids, accion):
+    """Callback: aplica la acción a todas las seleccionadas en un solo viaje y limpia la selección"""
+    if accion == 'eliminar':
+        aplicado = _escribir_optimista(lambda: db.eliminar_postulaciones(ids), ids, None,
+                                       f"🗑️ {len(ids)} postulaciones eliminadas")
+    else:
+        aplicado = _escribir_optimista(lambda: db.actualizar_estado_postulaciones(ids, accion),
+                                       ids, {"estado": accion},
+                                       f"✅ {len(ids)} postulaciones marcadas como {accion}")
+    if not aplicado:
+        return
+    
+    for postulacion_id in ids:
+        st.session_state.pop(f"sel_{postulacion_id}", None)
+    st.session_state['sel_pagina'] = False
+    st.session_state['conf_del_masivo'] = False
+
+def acciones_masivas(db, ids_pagina):
+    """Aprobar, rechazar o eliminar todas las postulaciones seleccionadas"""
+    seleccionadas = [pid for pid in ids_pagina if st.session_state.get(f"sel_{pid}")]
+    st.markdown(f"**☑️ Seleccionadas:** `{len(seleccionadas)}`")
+    
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
+    with col1:
+        st.button("✅ Aprobar seleccionadas", type="primary", disabled=not seleccionadas,
+                  on_click=_aplicar_masivo, args=(db, seleccionadas, 'aprobado'))
+    with col2:
+        st.button("❌ Rechazar seleccionadas", disabled=not seleccionadas,
+                  on_click=_aplicar_masivo, args=(db, seleccionadas, 'rechazado'))
+    with col4:
+        confirmar = st.checkbox("⚠️ Confirmar eliminación masiva", key="conf_del_masivo")
+    with col3:
+        st.button("🗑️ Eliminar seleccionadas", disabled=not (seleccionadas and confirmar),
+                  on_click=_aplicar_masivo, args=(db, seleccionadas, 'eliminar'))
+
+def editar_postulacion_admin(db, postulacion, titulo_oferta):
+    """Admin puede editar notas de cualquier postulación"""
+    postulacion_id = postulacion['id']
+    st.markdown(f"**✏️ Editando postulación:** {titulo_oferta}")
+    
+    # Formulario de edición (los datos actuales ya están en la vista local)
+    with st.form(key=f"edit_form_admin_{postulacion_id}"):
+        st.text_area(
+            "Notas adicionales (para uso interno del admin)",
+            value=postulacion.get('notas') or '',
+            key=f"notas_{postulacion_id}",
+            help="Estas notas solo las ve el administrador"
+        )
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.form_submit_button("💾 Guardar cambios", type="primary",
+                                  on_click=_guardar_notas, args=(db, postulacion_id))
+        
+        with col2:
+            st.form_submit_button("❌ Cancelar", type="secondary",
+                                  on_click=st.session_state.pop, args=('editando', None))
+
+def eliminar_postulacion_admin(db, postulacion_id, titulo_oferta):
+    """Admin puede eliminar cualquier postulación"""
+    st.markdown(f"**⚠️ ¿Eliminar postulación?** {titulo_oferta}")
+    st.warning("⚠️ **ADVERTENCIA:** Esta acción eliminará la postulación completamente")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.button("✅ Confirmar eliminación", key=f"conf_del_admin_{postulacion_id}", type="primary",
+                  on_click=_eliminar, args=(db, postulacion_id))
+    
+    with col2:
+        st.button("❌ Cancelar", key=f"cancel_del_admin_{postulacion_id}",
+                  on_click=st.session_state.pop, args=('eliminando', None))
+
+def exportar_postulaciones_admin(db):
+    """Exporta postulaciones a CSV o Parquet escribiendo página a página en disco"""
+    from exportar import exportar_postulaciones, fin_de_rango, archivo_temporal
+    
+    st.markdown("#### 📤 Exportar Postulaciones")
+    st.caption(f"Hasta {EXPORTACION_MAX_FILAS} filas desde el panel; para más, "
+               f"`python exportar.py salida.parquet` con los mismos filtros")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        estado = st.selectbox("Estado", ["Todos", "pendiente", "aprobado", "rechazado"], key="exp_estado")
+        empresa = st.text_input("Empresa", placeholder="Tech Solutions SAC", key="exp_empresa")
+    with col2:
+        rango = st.date_input("Rango de fechas", value=(), key="exp_rango")
+        formato = st.radio("Formato", ["csv", "parquet"], horizontal=True, key="exp_formato")
+    
+    if st.button("📤 Generar exportación", type="primary"):
+        desde = rango[0] if len(rango) > 0 else None
+        hasta = rango[1] if len(rango) > 1 else None
+        
+        # Se escribe a un archivo temporal para no acumular el reporte en memoria
+        anterior = st.session_state.pop('exportacion', None)
+        if anterior and os.path.exists(anterior['ruta']):
+            os.remove(anterior['ruta'])
+        ruta = archivo_temporal(formato)
+        
+        progreso = st.empty()
+        try:
+            total = exportar_postulaciones(
+                db, ruta, formato,
+                al_avanzar=lambda n: progreso.info(f"⏳ {n} filas escritas"),
+                max_filas=EXPORTACION_MAX_FILAS,
+                estado=None if estado == "Todos" else estado,
+                desde=desde.isoformat() if desde else None,
+                hasta=fin_de_rango(hasta),
+                empresa=empresa or None)
+        except Exception as e:
+            progreso.empty()
+            os.remove(ruta)
+            st.error(f"❌ Error al exportar: {e}")
+            return
+        
+        progreso.empty()
+        st.session_state['exportacion'] = {"ruta": ruta, "formato": formato, "total": total}
+    
+    exportacion = st.session_state.get('exportacion')
+    if exportacion and os.path.exists(exportacion['ruta']):
+        st.success(f"✅ {exportacion['total']} postulaciones exportadas")
+        with open(exportacion['ruta'], "rb") as f:
+            st.download_button("⬇️ Descargar", f, file_name=f"postulaciones.{exportacion['formato']}")
+
+def gestionar_usuarios(db):
+    """Gestión básica de usuarios"""
+    st.markdown("#### 👥 Gestión de Usuarios")
+    
+    # Solo para demostración
+    st.info("💡 En un sistema completo, aquí se gestionarían usuarios")
+    
+    if st.checkbox("Mostrar todos los usuarios (solo admin)"):
+        users = db.listar_usuarios()
+        if users.data:
+            import pandas as pd
+            df = pd.DataFrame(users.data)
             st.dataframe(df, use_container_width=True)
\ No newline at end of file
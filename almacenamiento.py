@@ -0,0 +1,91 @@
+import hashlib
+from abc import ABC, abstractmethod
+import os
+import re
+import tempfile
+import threading
+from config import ALMACENAMIENTO, CV_DIRECTORIO, CV_TAMANO_MAX
+
+# Tamaño de cada bloque leído del archivo subido: acota la memoria por subida
+BLOQUE = 64 * 1024
+
+_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+class ArchivoDemasiadoGrande(Exception):
+    """El archivo supera el tamaño máximo permitido"""
+    def __init__(self, maximo):
+        super().__init__(f"El archivo supera el máximo de {maximo // (1024 * 1024)} MB")
+        self.maximo = maximo
+
+class Almacenamiento(ABC):
+    """Interfaz de almacenamiento direccionado por contenido (la clave es el sha256 del archivo)"""
+    @abstractmethod
+    def guardar(self, flujo, tamano_max=CV_TAMANO_MAX):
+        """Guarda el contenido de un objeto tipo archivo y retorna su hash"""
+
+    @abstractmethod
+    def existe(self, clave):
+        """True si hay un archivo guardado con esa clave"""
+
+    @abstractmethod
+    def abrir(self, clave):
+        """Objeto tipo archivo (binario) para leer el contenido guardado"""
+
+class AlmacenamientoLocal(Almacenamiento):
+    """Archivos en disco bajo `directorio/ab/cd/<hash>`; un mismo contenido se guarda una sola vez"""
+    def __init__(self, directorio=CV_DIRECTORIO):
+        self.directorio = os.path.abspath(directorio)
+        self._temporales = os.path.join(self.directorio, "tmp")
+        os.makedirs(self._temporales, exist_ok=True)
+
+    def _ruta(self, clave):
+        if not _HASH.match(clave or ""):
+            raise ValueError(f"Clave de archivo inválida: {clave!r}")
+        return os.path.join(self.directorio, clave[:2], clave[2:4], clave)
+
+    def guardar(self, flujo, tamano_max=CV_TAMANO_MAX):
+        """Copia por bloques a un temporal calculando el hash; luego lo mueve a su ruta definitiva"""
+        sha = hashlib.sha256()
+        tamano = 0
+        # El temporal vive en el mismo disco para que os.replace sea atómico
+        descriptor, temporal = tempfile.mkstemp(dir=self._temporales)
+        try:
+            with os.fdopen(descriptor, "wb") as destino:
+                while bloque := flujo.read(BLOQUE):
+                    tamano += len(bloque)
+                    if tamano > tamano_max:
+                        raise ArchivoDemasiadoGrande(tamano_max)
+                    sha.update(bloque)
+                    destino.write(bloque)
+            clave = sha.hexdigest()
+            ruta = self._ruta(clave)
+            if os.path.exists(ruta):
+                # Contenido ya guardado (p. ej. el mismo CV en otra postulación)
+                os.remove(temporal)
+            else:
+                os.makedirs(os.path.dirname(ruta), exist_ok=True)
+                os.replace(temporal, ruta)
+            return clave
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+    def existe(self, clave):
+        return os.path.exists(self._ruta(clave))
+
+    def abrir(self, clave):
+        return open(self._ruta(clave), "rb")
+
+_almacenamiento = None
+_almacenamiento_lock = threading.Lock()
+
+def get_almacenamiento():
+    """Almacenamiento de archivos del proceso según ALMACENAMIENTO"""
+    global _almacenamiento
+    with _almacenamiento_lock:
+        if _almacenamiento is None:
+            if ALMACENAMIENTO != "local":
+                raise ValueError(f"Almacenamiento desconocido: {ALMACENAMIENTO}")
+            _almacenamiento = AlmacenamientoLocal()
+    return _almacenamiento
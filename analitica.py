@@ -0,0 +1,43 @@
+import pandas as pd
+from cache import CacheTTL
+from config import ANALITICA_TTL
+
+# Compartida por todas las sesiones admin: el panel no re-agrega en cada apertura
+cache_analitica = CacheTTL(ttl=ANALITICA_TTL)
+
+def _por_dimension(resumen, columna):
+    """Suma los agregados por oferta a la dimensión pedida (área, empresa o modalidad)"""
+    return resumen.groupby(columna, dropna=False)[["postulaciones", "aprobadas", "rechazadas", "pendientes"]]\
+        .sum()\
+        .sort_values("postulaciones", ascending=False)
+
+def _calcular(db):
+    resultados = db.en_paralelo(
+        resumen=db.obtener_resumen_por_oferta,
+        semanas=db.obtener_postulaciones_por_semana
+    )
+    
+    resumen = pd.DataFrame(resultados['resumen'].data,
+                           columns=["oferta_id", "titulo", "empresa", "area", "modalidad",
+                                    "postulaciones", "aprobadas", "rechazadas", "pendientes"])
+    
+    # Tasa de aprobación sobre las postulaciones ya resueltas
+    resueltas = resumen["aprobadas"] + resumen["rechazadas"]
+    resumen["tasa_aprobacion"] = (resumen["aprobadas"] / resueltas.where(resueltas > 0)).round(3)
+    
+    semanas = pd.DataFrame(resultados['semanas'].data, columns=["semana", "postulaciones"])
+    semanas["semana"] = pd.to_datetime(semanas["semana"])
+    
+    return {
+        "por_area": _por_dimension(resumen, "area"),
+        "por_empresa": _por_dimension(resumen, "empresa"),
+        "por_modalidad": _por_dimension(resumen, "modalidad"),
+        "por_oferta": resumen.sort_values("postulaciones", ascending=False)
+                             .set_index("titulo")[["empresa", "postulaciones", "aprobadas",
+                                                   "rechazadas", "tasa_aprobacion"]],
+        "por_semana": semanas.set_index("semana")["postulaciones"],
+    }
+
+def obtener_analitica(db):
+    """Tablas de analítica del panel admin (cacheadas ANALITICA_TTL segundos)"""
+    return cache_analitica.obtener("admin", lambda: _calcular(db))
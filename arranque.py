@@ -0,0 +1,71 @@
+"""Mide el tiempo de importación en frío por rol con `python -X importtime`.
+
+Uso:
+    python arranque.py                     # compara con arranque_baseline.json si existe
+    python arranque.py --actualizar        # guarda los resultados como nueva referencia
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+BASELINE = os.path.join(RAIZ, "arranque_baseline.json")
+
+# Lo que carga un proceso nuevo para cada página
+ESCENARIOS = {
+    "login": "import main",
+    "estudiante": "import main, student_dashboard",
+    "admin": "import main, admin_dashboard",
+}
+
+def medir(codigo):
+    """Milisegundos de importación (suma de tiempos propios) y paquetes más caros"""
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo],
+                             cwd=RAIZ, capture_output=True, text=True, check=True)
+    total, paquetes = 0, {}
+    for linea in proceso.stderr.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        total += int(propio)
+        nombre = nombre.strip()
+        if "." not in nombre and not nombre.startswith("_"):
+            paquetes[nombre] = max(paquetes.get(nombre, 0), int(acumulado) / 1000)
+    mas_caros = sorted(paquetes.items(), key=lambda item: item[1], reverse=True)[:8]
+    return total / 1000, mas_caros
+
+def main():
+    parser = argparse.ArgumentParser(description="Tiempo de importación en frío por rol")
+    parser.add_argument("--repeticiones", type=int, default=7)
+    parser.add_argument("--baseline", default=BASELINE, help="Archivo JSON de referencia")
+    parser.add_argument("--actualizar", action="store_true", help="Guarda los resultados como referencia")
+    args = parser.parse_args()
+
+    referencia = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            referencia = json.load(f)
+
+    resultados = {}
+    for escenario, codigo in ESCENARIOS.items():
+        mediciones = [medir(codigo) for _ in range(args.repeticiones)]
+        milisegundos = round(statistics.median(total for total, _ in mediciones), 1)
+        resultados[escenario] = milisegundos
+
+        linea = f"{escenario:<11} {milisegundos:>8.1f} ms"
+        if escenario in referencia:
+            linea += f"  (referencia {referencia[escenario]:.1f} ms, {milisegundos - referencia[escenario]:+.1f})"
+        print(linea)
+        for modulo, acumulado in mediciones[-1][1]:
+            print(f"    {modulo:<28} {acumulado:>8.1f} ms")
+
+    if args.actualizar:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(resultados, f, indent=2, sort_keys=True)
+        print(f"💾 Referencia guardada en {args.baseline}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Benchmark de renderizado de los paneles con AppTest contra el backend en memoria.
+
+Uso:
+    python benchmark.py                          # compara con benchmark_baseline.json
+    python benchmark.py --volumenes 10,1000      # solo esos volúmenes
+    python benchmark.py --actualizar             # guarda los resultados como nueva referencia
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Debe fijarse antes de importar config: todos los módulos usan el backend en memoria
+os.environ["BACKEND"] = "memoria"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from streamlit.testing.v1 import AppTest
+
+import analitica
+import database
+import memoria
+# Los paneles se importan de forma diferida; se cargan aquí para no medir su importación
+# en el primer render (eso lo mide arranque.py)
+import admin_dashboard, student_dashboard, importar_ofertas, exportar
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+APP = os.path.join(RAIZ, "main.py")
+BASELINE = os.path.join(RAIZ, "benchmark_baseline.json")
+
+VOLUMENES = (10, 1000, 50000)
+
+# (rol, opción del menú lateral, clave del resultado)
+PAGINAS = [
+    (None, None, "inicio"),
+    ("estudiante", "🔍 Buscar Prácticas", "estudiante/buscar"),
+    ("estudiante", "📋 Mis Postulaciones", "estudiante/postulaciones"),
+    ("estudiante", "👤 Mi Perfil", "estudiante/perfil"),
+    ("admin", "📊 Dashboard", "admin/dashboard"),
+    ("admin", "🏢 Gestionar Ofertas", "admin/ofertas"),
+    ("admin", "📋 Revisar Postulaciones", "admin/postulaciones"),
+    ("admin", "📤 Exportar", "admin/exportar"),
+    ("admin", "👥 Usuarios", "admin/usuarios"),
+]
+
+# Tolerancias relativas; el número de consultas no puede crecer
+TOLERANCIAS = {"segundos": 0.5, "pico_memoria": 0.25, "bytes": 0.1, "consultas": 0.0}
+
+def preparar_datos(volumen):
+    """Reemplaza el cliente en memoria del proceso por uno sembrado con `volumen` ofertas y postulaciones"""
+    memoria._cliente = memoria.sembrar(memoria.ClienteMemoria(), ofertas=volumen, postulaciones=volumen)
+    return memoria._cliente
+
+# La carga completa de la instantánea de postulaciones corre en otro hilo y sus consultas se
+# mezclarían con las del render medido: el benchmark mide el primer render (paginado en el servidor)
+database.recargar_en_segundo_plano = lambda: None
+
+def vaciar_caches():
+    """Cada medición parte de caches compartidas frías"""
+    database.cache_ofertas.invalidar()
+    database.cache_estadisticas.invalidar()
+    analitica.cache_analitica.invalidar()
+    with database.instantanea_postulaciones.lock:
+        database.instantanea_postulaciones.reiniciar()
+
+def usuario(cliente, rol):
+    email = "admin@demo.local" if rol == "admin" else "estudiante0@demo.local"
+    return cliente.table("users").select("*").eq("email", email).execute().data[0]
+
+def medir(cliente, rol, opcion, timeout):
+    """Renderiza una vez para abrir la sesión y mide el rerun que navega a la opción pedida"""
+    app = AppTest.from_file(APP, default_timeout=timeout)
+    if rol:
+        app.session_state['user'] = usuario(cliente, rol)
+    app.run()
+
+    if opcion:
+        menu = next(radio for radio in app.sidebar.radio if opcion in radio.options)
+        menu.set_value(opcion)
+    vaciar_caches()
+    cliente.metricas.update(consultas=0, filas=0, bytes=0)
+
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    app.run()
+    segundos = time.perf_counter() - inicio
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    if app.exception:
+        raise RuntimeError(f"{rol}/{opcion}: {app.exception[0].value}")
+    return {
+        "segundos": round(segundos, 4),
+        "consultas": cliente.metricas["consultas"],
+        "filas": cliente.metricas["filas"],
+        "bytes": cliente.metricas["bytes"],
+        "pico_memoria": pico,
+    }
+
+def ejecutar(volumenes, timeout):
+    resultados = {}
+    for volumen in volumenes:
+        cliente = preparar_datos(volumen)
+        resultados[str(volumen)] = {}
+        for rol, opcion, clave in PAGINAS:
+            medida = medir(cliente, rol, opcion, timeout)
+            resultados[str(volumen)][clave] = medida
+            print(f"{volumen:>7} {clave:<26} {medida['segundos']:>8.3f}s {medida['consultas']:>4} consultas "
+                  f"{medida['bytes'] / 1024:>10.1f} KiB {medida['pico_memoria'] / 2**20:>8.1f} MiB")
+    return resultados
+
+def regresiones(actual, referencia, escala_tiempo):
+    """Métricas que empeoraron más que su tolerancia respecto a la referencia"""
+    encontradas = []
+    for volumen, paginas in actual.items():
+        for clave, medida in paginas.items():
+            base = referencia.get(volumen, {}).get(clave)
+            if not base:
+                continue
+            for metrica, tolerancia in TOLERANCIAS.items():
+                if metrica == "segundos":
+                    tolerancia *= escala_tiempo
+                limite = base[metrica] * (1 + tolerancia)
+                # Margen absoluto para que tiempos de milisegundos no den falsos positivos
+                if metrica == "segundos":
+                    limite += 0.05
+                if medida[metrica] > limite:
+                    encontradas.append(f"{volumen} {clave} {metrica}: {base[metrica]} -> {medida[metrica]}")
+    return encontradas
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark headless de los paneles")
+    parser.add_argument("--volumenes", default=",".join(map(str, VOLUMENES)),
+                        help="Ofertas y postulaciones a sembrar, separadas por comas")
+    parser.add_argument("--baseline", default=BASELINE, help="Archivo JSON de referencia")
+    parser.add_argument("--actualizar", action="store_true", help="Guarda los resultados como referencia")
+    parser.add_argument("--escala-tiempo", type=float, default=1.0,
+                        help="Multiplica la tolerancia de tiempo (máquinas más lentas o CI)")
+    parser.add_argument("--timeout", type=float, default=300, help="Segundos máximos por render")
+    args = parser.parse_args()
+
+    volumenes = [int(v) for v in args.volumenes.split(",")]
+    resultados = ejecutar(volumenes, args.timeout)
+
+    if args.actualizar or not os.path.exists(args.baseline):
+        referencia = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                referencia = json.load(f)
+        referencia.update(resultados)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(referencia, f, indent=2, ensure_ascii=False, sort_keys=True)
+        print(f"💾 Referencia guardada en {args.baseline}")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        referencia = json.load(f)
+    encontradas = regresiones(resultados, referencia, args.escala_tiempo)
+    if encontradas:
+        print("❌ Regresiones respecto a la referencia:")
+        for linea in encontradas:
+            print(f"   {linea}")
+        sys.exit(1)
+    print("✅ Sin regresiones")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import threading
+import time
+from collections import OrderedDict
+
+class CacheTTL:
+    """Cache en memoria del proceso, compartida entre sesiones, con expiración por tiempo y tamaño máximo (LRU)"""
+    def __init__(self, ttl, max_entradas=None):
+        self.ttl = ttl
+        self.max_entradas = max_entradas
+        self._datos = OrderedDict()
+        self._lock = threading.Lock()
+        self._metricas = {"aciertos": 0, "fallos": 0, "expulsiones": 0, "invalidaciones": 0}
+        self._generacion = 0
+
+    def obtener(self, clave, calcular):
+        """Retorna el valor vigente de la clave o lo calcula y lo guarda"""
+        ahora = time.monotonic()
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada and entrada[0] > ahora:
+                self._datos.move_to_end(clave)
+                self._metricas["aciertos"] += 1
+                return entrada[1]
+            self._metricas["fallos"] += 1
+            generacion = self._generacion
+
+        valor = calcular()
+        with self._lock:
+            # Si hubo una invalidación mientras se calculaba, el valor puede estar obsoleto
+            if generacion != self._generacion:
+                return valor
+            self._datos[clave] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            self._expulsar()
+        return valor
+
+    def consultar(self, clave):
+        """Retorna el valor vigente de la clave o None, sin calcular nada"""
+        with self._lock:
+            entrada = self._datos.get(clave)
+            if entrada and entrada[0] > time.monotonic():
+                self._metricas["aciertos"] += 1
+                return entrada[1]
+            self._metricas["fallos"] += 1
+            return None
+
+    def guardar(self, clave, valor):
+        """Guarda un valor con el TTL de la cache"""
+        with self._lock:
+            self._datos[clave] = (time.monotonic() + self.ttl, valor)
+            self._datos.move_to_end(clave)
+            self._expulsar()
+
+    def _expulsar(self):
+        """Expulsa las entradas usadas hace más tiempo (requiere el lock)"""
+        while self.max_entradas and len(self._datos) > self.max_entradas:
+            self._datos.popitem(last=False)
+            self._metricas["expulsiones"] += 1
+
+    def invalidar(self, clave=None):
+        """Elimina una clave o, sin argumentos, toda la cache"""
+        with self._lock:
+            self._metricas["invalidaciones"] += 1
+            self._generacion += 1
+            if clave is None:
+                self._datos.clear()
+            else:
+                self._datos.pop(clave, None)
+
+    def metricas(self):
+        """Aciertos, fallos, expulsiones y tamaño actual de la cache"""
+        with self._lock:
+            consultas = self._metricas["aciertos"] + self._metricas["fallos"]
+            return {
+                **self._metricas,
+                "entradas": len(self._datos),
+                "tasa_aciertos": round(self._metricas["aciertos"] / consultas, 3) if consultas else 0.0
+            }
@@ -1,60 +1,344 @@
-import os
-from supabase import create_client, Client
-from dotenv import load_dotenv
-
-load_dotenv()
-
-SUPABASE_URL = os.getenv("SUPABASE_URL")
-SUPABASE_KEY = os.getenv("SUPABASE_KEY")
-
-def get_supabase_client() -> Client:
-    """Crea y retorna cliente Supabase autenticado"""
-    if not SUPABASE_URL or not SUPABASE_KEY:
-        raise ValueError(" Credenciales de Supabase no encontradas en .env")
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
-
-# Inicializar tablas si no existen (ejecutar una vez)
-def init_database():
-    """Inicializa las tablas necesarias en Supabase"""
-    sb = get_supabase_client()
-    
-    # Las tablas deben crearse en el dashboard de Supabase con SQL:
-    """
-    CREATE TABLE users (
-        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-        email TEXT UNIQUE NOT NULL,
-        password_hash TEXT NOT NULL,
-        role TEXT DEFAULT 'estudiante',
-        nombre TEXT,
-        apellido TEXT,
-        dni TEXT UNIQUE,
-        telefono TEXT,
-        carrera TEXT,
-        universidad TEXT,
-        created_at TIMESTAMP DEFAULT NOW()
-    );
-    
-    CREATE TABLE ofertas_practicas (
-        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-        titulo TEXT NOT NULL,
-        empresa TEXT NOT NULL,
-        area TEXT NOT NULL,
-        duracion TEXT,
-        modalidad TEXT,
-        ubicacion TEXT,
-        requisitos TEXT,
-        descripcion TEXT,
-        estado TEXT DEFAULT 'activa',
-        created_at TIMESTAMP DEFAULT NOW()
-    );
-    
-    CREATE TABLE postulaciones (
-        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
-        user_id UUID REFERENCES users(id),
-        oferta_id UUID REFERENCES ofertas_practicas(id),
-        estado TEXT DEFAULT 'pendiente',
-        fecha_postulacion TIMESTAMP DEFAULT NOW(),
-        archivo_cv TEXT
-    );
-    """
+import os
+import tempfile
+import threading
+import time
+
+# supabase, httpx y python-dotenv se importan al usarse: un proceso nuevo no los carga hasta la primera consulta
+
+def _cargar_dotenv():
+    """Carga el .env más cercano (desde este directorio hacia arriba), solo si existe"""
+    directorio = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        ruta = os.path.join(directorio, ".env")
+        if os.path.isfile(ruta):
+            from dotenv import load_dotenv
+            load_dotenv(ruta)
+            return
+        padre = os.path.dirname(directorio)
+        if padre == directorio:
+            return
+        directorio = padre
+
+_cargar_dotenv()
+
+SUPABASE_URL = os.getenv("SUPABASE_URL")
+SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+
+# Backend de datos: "supabase" o "memoria" (local, sin red, con datos sintéticos)
+BACKEND = os.getenv("BACKEND", "supabase")
+MEMORIA_OFERTAS = int(os.getenv("MEMORIA_OFERTAS", "50"))
+MEMORIA_POSTULACIONES = int(os.getenv("MEMORIA_POSTULACIONES", "200"))
+
+# Almacenamiento de CVs: "local" (disco, direccionado por sha256) y tamaño máximo en bytes
+ALMACENAMIENTO = os.getenv("ALMACENAMIENTO", "local")
+CV_DIRECTORIO = os.getenv("CV_DIRECTORIO", os.path.join(os.path.dirname(os.path.abspath(__file__)), "archivos_cv"))
+CV_TAMANO_MAX = int(os.getenv("CV_TAMANO_MAX", str(5 * 1024 * 1024)))
+
+# Pool de conexiones HTTP compartido por todo el proceso
+SUPABASE_POOL_SIZE = int(os.getenv("SUPABASE_POOL_SIZE", "10"))
+SUPABASE_KEEPALIVE = float(os.getenv("SUPABASE_KEEPALIVE", "30"))
+
+# Resiliencia: timeout por petición, reintentos de lecturas y circuit breaker (segundos)
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+SUPABASE_TIMEOUT_CONEXION = float(os.getenv("SUPABASE_TIMEOUT_CONEXION", "3"))
+REINTENTOS_LECTURA = int(os.getenv("REINTENTOS_LECTURA", "2"))
+REINTENTO_BASE = float(os.getenv("REINTENTO_BASE", "0.2"))
+REINTENTO_MAX = float(os.getenv("REINTENTO_MAX", "2"))
+CIRCUITO_FALLOS = int(os.getenv("CIRCUITO_FALLOS", "5"))
+CIRCUITO_ESPERA = float(os.getenv("CIRCUITO_ESPERA", "30"))
+
+# Hilos para lanzar consultas independientes en paralelo
+CONSULTAS_PARALELAS = int(os.getenv("CONSULTAS_PARALELAS", "8"))
+
+# Máximo de ids por sentencia en operaciones masivas (limita el largo de la URL)
+LOTE_IDS = int(os.getenv("LOTE_IDS", "200"))
+
+# Segundos que se reutilizan las estadísticas del panel admin
+ESTADISTICAS_TTL = int(os.getenv("ESTADISTICAS_TTL", "30"))
+ANALITICA_TTL = int(os.getenv("ANALITICA_TTL", "300"))
+
+# Sincronización incremental de postulaciones (segundos)
+SYNC_SOLAPE = int(os.getenv("SYNC_SOLAPE", "5"))
+SYNC_LOTE = int(os.getenv("SYNC_LOTE", "1000"))
+SYNC_RETENCION = int(os.getenv("SYNC_RETENCION", str(7 * 24 * 3600)))
+
+# Cache compartida del catálogo de ofertas
+CATALOGO_TTL = int(os.getenv("CATALOGO_TTL", "60"))
+CATALOGO_MAX_ENTRADAS = int(os.getenv("CATALOGO_MAX_ENTRADAS", "256"))
+
+# Hashing de contraseñas
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+BCRYPT_WORKERS = int(os.getenv("BCRYPT_WORKERS", str(os.cpu_count() or 2)))
+BCRYPT_MAX_COLA = int(os.getenv("BCRYPT_MAX_COLA", "32"))
+
+# Límite de intentos de login (ventana deslizante en segundos)
+LOGIN_VENTANA = int(os.getenv("LOGIN_VENTANA", "300"))
+LOGIN_MAX_INTENTOS_EMAIL = int(os.getenv("LOGIN_MAX_INTENTOS_EMAIL", "5"))
+LOGIN_MAX_INTENTOS_SESION = int(os.getenv("LOGIN_MAX_INTENTOS_SESION", "20"))
+LOGIN_INEXISTENTES_TTL = int(os.getenv("LOGIN_INEXISTENTES_TTL", "300"))
+
+# Exportaciones desde el panel: tope de filas (más grandes, con python exportar.py) y
+# segundos que se conservan los archivos generados
+EXPORTACION_MAX_FILAS = int(os.getenv("EXPORTACION_MAX_FILAS", "20000"))
+EXPORTACION_TTL = int(os.getenv("EXPORTACION_TTL", "3600"))
+EXPORTACION_DIRECTORIO = os.getenv("EXPORTACION_DIRECTORIO",
+                                   os.path.join(tempfile.gettempdir(), "practicas_exportaciones"))
+
+# Consultas por render a partir de las cuales se avisa (0 desactiva el aviso)
+PRESUPUESTO_CONSULTAS = int(os.getenv("PRESUPUESTO_CONSULTAS", "12"))
+
+_cliente = None
+_cliente_lock = threading.Lock()
+_stats_lock = threading.Lock()
+_stats_pool = {"peticiones": 0, "conexiones_nuevas": 0}
+_ultima_respuesta = threading.local()
+
+def _registrar_evento_conexion(evento, info):
+    """Cuenta las conexiones TCP nuevas que abre el pool"""
+    if evento == "connection.connect_tcp.complete":
+        with _stats_lock:
+            _stats_pool["conexiones_nuevas"] += 1
+
+def _registrar_peticion(request):
+    """Engancha el trazado de httpcore a cada petición saliente"""
+    request.extensions["trace"] = _registrar_evento_conexion
+    with _stats_lock:
+        _stats_pool["peticiones"] += 1
+
+def _registrar_respuesta(response):
+    """Guarda el tamaño del cuerpo de la última respuesta de este hilo (para la instrumentación)"""
+    response.read()
+    _ultima_respuesta.bytes = len(response.content)
+
+def bytes_ultima_respuesta():
+    """Bytes de la última respuesta HTTP recibida en este hilo, o None si no hubo ninguna"""
+    tamano = getattr(_ultima_respuesta, "bytes", None)
+    _ultima_respuesta.bytes = None
+    return tamano
+
+def _crear_sesion_pool(sesion):
+    """Reemplaza la sesión HTTP de PostgREST por una con keep-alive y límites configurables"""
+    import httpx
+    from postgrest.utils import SyncClient
+    
+    return SyncClient(
+        base_url=sesion.base_url,
+        headers=sesion.headers,
+        # Sin timeout una respuesta lenta bloquearía el hilo del script indefinidamente;
+        # pool acota la espera por una conexión libre cuando el pool está agotado
+        timeout=httpx.Timeout(SUPABASE_TIMEOUT, connect=SUPABASE_TIMEOUT_CONEXION,
+                              pool=SUPABASE_TIMEOUT_CONEXION),
+        follow_redirects=True,
+        http2=True,
+        limits=httpx.Limits(
+            max_connections=SUPABASE_POOL_SIZE,
+            max_keepalive_connections=SUPABASE_POOL_SIZE,
+            keepalive_expiry=SUPABASE_KEEPALIVE,
+        ),
+        event_hooks={"request": [_registrar_peticion], "response": [_registrar_respuesta]},
+    )
+
+def get_supabase_client():
+    """Retorna el cliente Supabase compartido del proceso (se crea una sola vez)"""
+    global _cliente
+    if _cliente is not None:
+        return _cliente
+
+    with _cliente_lock:
+        if _cliente is None:
+            if not SUPABASE_URL or not SUPABASE_KEY:
+                raise ValueError(" Credenciales de Supabase no encontradas en .env")
+            from supabase import create_client
+            cliente = create_client(SUPABASE_URL, SUPABASE_KEY)
+            postgrest = cliente.postgrest
+            sesion_original = postgrest.session
+            postgrest.session = _crear_sesion_pool(sesion_original)
+            sesion_original.close()
+            _cliente = cliente
+    return _cliente
+
+def get_cliente():
+    """Cliente de datos según BACKEND; ambos exponen la misma interfaz table()/rpc() de PostgREST"""
+    if BACKEND == "memoria":
+        from memoria import cliente_memoria
+        return cliente_memoria()
+    if BACKEND != "supabase":
+        raise ValueError(f" BACKEND desconocido: {BACKEND}")
+    return get_supabase_client()
+
+def estadisticas_pool():
+    """Retorna cuántas peticiones reutilizaron una conexión y cuántas abrieron una nueva"""
+    with _stats_lock:
+        peticiones = _stats_pool["peticiones"]
+        nuevas = _stats_pool["conexiones_nuevas"]
+    return {
+        "tamano_pool": SUPABASE_POOL_SIZE,
+        "peticiones": peticiones,
+        "conexiones_nuevas": nuevas,
+        "conexiones_reutilizadas": max(peticiones - nuevas, 0)
+    }
+
+def verificar_conexion():
+    """Health check: hace una consulta mínima y retorna estado y latencia"""
+    inicio = time.perf_counter()
+    try:
+        get_cliente().table("users").select("id").limit(1).execute()
+        ok, error = True, None
+    except Exception as e:
+        ok, error = False, str(e)
+    return {
+        "ok": ok,
+        "latencia_ms": round((time.perf_counter() - inicio) * 1000, 1),
+        "error": error,
+        **estadisticas_pool()
+    }
+
+# Inicializar tablas si no existen (ejecutar una vez)
+def init_database():
+    """Inicializa las tablas necesarias en Supabase"""
+    sb = get_supabase_client()
+    
+    # Las tablas deben crearse en el dashboard de Supabase con SQL:
+    """
+    CREATE TABLE users (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        email TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        role TEXT DEFAULT 'estudiante',
+        nombre TEXT,
+        apellido TEXT,
+        dni TEXT UNIQUE,
+        telefono TEXT,
+        carrera TEXT,
+        universidad TEXT,
+        created_at TIMESTAMP DEFAULT NOW()
+    );
+    
+    -- Emails siempre en minúsculas (auth los normaliza con throttle.normalizar_email).
+    -- En bases creadas antes, buscar primero las cuentas que solo difieren en mayúsculas y
+    -- fusionarlas (o renombrar una) a mano, o la migración falla por UNIQUE:
+    --   SELECT lower(trim(email)), array_agg(id) FROM users GROUP BY 1 HAVING count(*) > 1;
+    UPDATE users SET email = lower(trim(email)) WHERE email <> lower(trim(email));
+    CREATE UNIQUE INDEX users_email_lower_key ON users (lower(email));
+    ALTER TABLE users ADD CONSTRAINT users_email_minusculas CHECK (email = lower(trim(email)));
+    
+    CREATE TABLE ofertas_practicas (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        titulo TEXT NOT NULL,
+        empresa TEXT NOT NULL,
+        area TEXT NOT NULL,
+        duracion TEXT,
+        modalidad TEXT,
+        ubicacion TEXT,
+        requisitos TEXT,
+        descripcion TEXT,
+        estado TEXT DEFAULT 'activa' CHECK (estado IN ('activa', 'cerrada')),
+        created_at TIMESTAMP DEFAULT NOW(),
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    );
+    
+    CREATE TABLE postulaciones (
+        id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+        user_id UUID REFERENCES users(id),
+        oferta_id UUID REFERENCES ofertas_practicas(id),
+        estado TEXT DEFAULT 'pendiente',
+        fecha_postulacion TIMESTAMP DEFAULT NOW(),
+        archivo_cv TEXT,
+        notas TEXT,
+        updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+    );
+    
+    -- Sincronización incremental: marca de modificación y registro de eliminaciones
+    CREATE INDEX ofertas_practicas_updated_at_idx ON ofertas_practicas (updated_at, id);
+    CREATE INDEX postulaciones_updated_at_idx ON postulaciones (updated_at, id);
+    
+    CREATE OR REPLACE FUNCTION tocar_updated_at() RETURNS TRIGGER AS $$
+    BEGIN
+        NEW.updated_at = clock_timestamp();
+        RETURN NEW;
+    END $$ LANGUAGE plpgsql;
+    CREATE TRIGGER ofertas_practicas_updated_at BEFORE UPDATE ON ofertas_practicas
+        FOR EACH ROW EXECUTE FUNCTION tocar_updated_at();
+    CREATE TRIGGER postulaciones_updated_at BEFORE UPDATE ON postulaciones
+        FOR EACH ROW EXECUTE FUNCTION tocar_updated_at();
+    
+    CREATE TABLE eliminaciones (
+        tabla TEXT NOT NULL,
+        fila_id UUID NOT NULL,
+        eliminado_en TIMESTAMPTZ NOT NULL DEFAULT clock_timestamp()
+    );
+    CREATE INDEX eliminaciones_tabla_idx ON eliminaciones (tabla, eliminado_en);
+    
+    CREATE OR REPLACE FUNCTION registrar_eliminacion() RETURNS TRIGGER AS $$
+    BEGIN
+        INSERT INTO eliminaciones (tabla, fila_id) VALUES (TG_TABLE_NAME, OLD.id);
+        RETURN OLD;
+    END $$ LANGUAGE plpgsql;
+    CREATE TRIGGER postulaciones_eliminacion AFTER DELETE ON postulaciones
+        FOR EACH ROW EXECUTE FUNCTION registrar_eliminacion();
+    
+    -- Purgar a diario las marcas con más de SYNC_RETENCION (p. ej. con pg_cron):
+    -- DELETE FROM eliminaciones WHERE eliminado_en < NOW() - INTERVAL '7 days';
+    
+    -- Búsqueda de texto completo en ofertas: sin acentos, con pesos y ranking
+    CREATE EXTENSION IF NOT EXISTS unaccent;
+    CREATE TEXT SEARCH CONFIGURATION es_sin_acentos (COPY = spanish);
+    ALTER TEXT SEARCH CONFIGURATION es_sin_acentos
+        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+    
+    ALTER TABLE ofertas_practicas ADD COLUMN busqueda TSVECTOR
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('es_sin_acentos', coalesce(titulo, '')), 'A') ||
+            setweight(to_tsvector('es_sin_acentos', coalesce(empresa, '') || ' ' ||
+                coalesce(area, '') || ' ' || coalesce(ubicacion, '')), 'B') ||
+            setweight(to_tsvector('es_sin_acentos', coalesce(requisitos, '') || ' ' ||
+                coalesce(descripcion, '')), 'C')
+        ) STORED;
+    CREATE INDEX ofertas_busqueda_idx ON ofertas_practicas USING GIN (busqueda);
+    
+    -- Filtro de ubicación parcial, sin acentos ni mayúsculas ("lima" encuentra "Lima, Perú")
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE OR REPLACE FUNCTION sin_acentos(texto TEXT) RETURNS TEXT AS $$
+        SELECT lower(public.unaccent('public.unaccent', texto));
+    $$ LANGUAGE SQL IMMUTABLE;
+    ALTER TABLE ofertas_practicas ADD COLUMN ubicacion_normalizada TEXT
+        GENERATED ALWAYS AS (sin_acentos(coalesce(ubicacion, ''))) STORED;
+    CREATE INDEX ofertas_ubicacion_trgm_idx ON ofertas_practicas
+        USING GIN (ubicacion_normalizada gin_trgm_ops);
+    
+    CREATE OR REPLACE FUNCTION buscar_ofertas(texto TEXT)
+    RETURNS TABLE (id UUID, titulo TEXT, empresa TEXT, area TEXT, duracion TEXT,
+                   modalidad TEXT, ubicacion TEXT, ubicacion_normalizada TEXT, estado TEXT,
+                   created_at TIMESTAMP, rango REAL) AS $$
+        SELECT o.id, o.titulo, o.empresa, o.area, o.duracion, o.modalidad, o.ubicacion,
+               o.ubicacion_normalizada, o.estado, o.created_at, ts_rank(o.busqueda, q)
+        FROM ofertas_practicas o, websearch_to_tsquery('es_sin_acentos', texto) q
+        WHERE o.busqueda @@ q;
+    $$ LANGUAGE SQL STABLE;
+    
+    -- Agregados para la analítica del panel admin (se agrupan en Postgres)
+    CREATE VIEW resumen_postulaciones_oferta AS
+        SELECT o.id AS oferta_id, o.titulo, o.empresa, o.area, o.modalidad,
+               COUNT(p.id) AS postulaciones,
+               COUNT(p.id) FILTER (WHERE p.estado = 'aprobado') AS aprobadas,
+               COUNT(p.id) FILTER (WHERE p.estado = 'rechazado') AS rechazadas,
+               COUNT(p.id) FILTER (WHERE p.estado = 'pendiente') AS pendientes
+        FROM ofertas_practicas o
+        LEFT JOIN postulaciones p ON p.oferta_id = o.id
+        GROUP BY o.id;
+    
+    CREATE VIEW postulaciones_por_semana AS
+        SELECT date_trunc('week', fecha_postulacion)::DATE AS semana, COUNT(*) AS postulaciones
+        FROM postulaciones
+        GROUP BY 1;
+    
+    -- Estadísticas del panel admin en una sola llamada
+    CREATE OR REPLACE FUNCTION estadisticas_admin()
+    RETURNS TABLE (total_ofertas BIGINT, total_postulaciones BIGINT, pendientes BIGINT) AS $$
+        SELECT
+            (SELECT COUNT(*) FROM ofertas_practicas),
+            (SELECT COUNT(*) FROM postulaciones),
+            (SELECT COUNT(*) FROM postulaciones WHERE estado = 'pendiente');
+    $$ LANGUAGE SQL STABLE;
+    """
     print(" Verifica que las tablas estén creadas en Supabase")
\ No newline at end of file
@@ -1,130 +1,686 @@
-import bcrypt
-from config import get_supabase_client
-from datetime import datetime
-
-class Database:
-    def __init__(self):
-        self.sb = get_supabase_client()
-
-    # USUARIOS
-    def crear_usuario(self, email, password, role="estudiante", **datos):
-        """Crea usuario con contraseña hasheada"""
-        hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt()).decode()
-        data = {
-            "email": email,
-            "password_hash": hashed,
-            "role": role,
-            **datos
-        }
-        return self.sb.table("users").insert(data).execute()
-
-    def obtener_usuario_por_email(self, email):
-        """Busca usuario por email"""
-        return self.sb.table("users").select("*").eq("email", email).execute()
-
-    def verificar_password(self, password, hashed):
-        """Verifica contraseña"""
-        return bcrypt.checkpw(password.encode(), hashed.encode())
-
-    # OFERTAS
-    def crear_oferta(self, datos):
-        """Crea nueva oferta de práctica"""
-        return self.sb.table("ofertas_practicas").insert(datos).execute()
-
-    def obtener_ofertas(self, filtros=None):
-        """Obtiene ofertas con filtros opcionales"""
-        query = self.sb.table("ofertas_practicas").select("*")
-        
-        if filtros:
-            for key, value in filtros.items():
-                if value:
-                    query = query.eq(key, value)
-        
-        return query.execute()
-
-    def obtener_oferta_por_id(self, oferta_id):
-        """Obtiene una oferta específica"""
-        return self.sb.table("ofertas_practicas").select("*").eq("id", oferta_id).execute()
-
-    def actualizar_oferta(self, oferta_id, datos):
-        """Actualiza oferta"""
-        return self.sb.table("ofertas_practicas").update(datos).eq("id", oferta_id).execute()
-
-    def eliminar_oferta(self, oferta_id):
-        """Elimina oferta"""
-        return self.sb.table("ofertas_practicas").delete().eq("id", oferta_id).execute()
-
-    # POSTULACIONES
-    def crear_postulacion(self, user_id, oferta_id, archivo_cv=None):
-        """Crea postulación"""
-        data = {
-            "user_id": user_id,
-            "oferta_id": oferta_id,
-            "archivo_cv": archivo_cv
-        }
-        return self.sb.table("postulaciones").insert(data).execute()
-
-    def obtener_postulaciones_por_usuario(self, user_id):
-        """Obtiene postulaciones de un estudiante"""
-        return self.sb.table("postulaciones")\
-            .select("*, ofertas_practicas(*)")\
-            .eq("user_id", user_id)\
-            .execute()
-
-    def obtener_postulaciones_admin(self):
-        """Obtiene todas las postulaciones para admin"""
-        return self.sb.table("postulaciones")\
-            .select("*, ofertas_practicas(*), users(nombre, apellido, email)")\
-            .execute()
-
-    def actualizar_estado_postulacion(self, postulacion_id, nuevo_estado):
-        """Actualiza estado de postulación"""
-        return self.sb.table("postulaciones")\
-            .update({"estado": nuevo_estado})\
-            .eq("id", postulacion_id)\
-            .execute()
-
-    # MÉTODOS NUEVOS PARA EDITAR/ELIMINAR POSTULACIONES
-    def actualizar_postulacion(self, postulacion_id, datos):
-        """Actualiza datos de una postulación"""
-        return self.sb.table("postulaciones").update(datos).eq("id", postulacion_id).execute()
-
-    def eliminar_postulacion(self, postulacion_id):
-        """Elimina una postulación"""
-        return self.sb.table("postulaciones").delete().eq("id", postulacion_id).execute()
-
-    def obtener_postulacion_por_id(self, postulacion_id):
-        """Obtiene una postulación específica"""
-        return self.sb.table("postulaciones").select("*").eq("id", postulacion_id).execute()
-
-    # ESTADÍSTICAS
-    def get_estadisticas(self):
-        """Obtiene estadísticas para el panel admin"""
-        try:
-            # Contar ofertas
-            ofertas_resp = self.sb.table("ofertas_practicas").select("*", count="exact").execute()
-            total_ofertas = getattr(ofertas_resp, 'count', 0) or 0
-
-            # Contar postulaciones
-            postulaciones_resp = self.sb.table("postulaciones").select("*", count="exact").execute()
-            total_postulaciones = getattr(postulaciones_resp, 'count', 0) or 0
-
-            # Contar pendientes
-            pendientes_resp = self.sb.table("postulaciones")\
-                .select("*", count="exact")\
-                .eq("estado", "pendiente")\
-                .execute()
-            postulaciones_pendientes = getattr(pendientes_resp, 'count', 0) or 0
-
-            return {
-                "total_ofertas": total_ofertas,
-                "total_postulaciones": total_postulaciones,
-                "pendientes": postulaciones_pendientes
-            }
-        except Exception as e:
-            print(f"⚠️ Error obteniendo estadísticas: {e}")
-            return {
-                "total_ofertas": 0,
-                "total_postulaciones": 0,
-                "pendientes": 0
-            }
\ No newline at end of file
+import base64
+import functools
+import json
+import logging
+import threading
+import time
+import unicodedata
+from concurrent.futures import Future, ThreadPoolExecutor
+from config import (get_cliente, ESTADISTICAS_TTL, CATALOGO_TTL,
+                    CATALOGO_MAX_ENTRADAS, CONSULTAS_PARALELAS, LOTE_IDS,
+                    SYNC_SOLAPE, SYNC_LOTE, SYNC_RETENCION)
+from cache import CacheTTL
+from instrumentacion import ClienteInstrumentado, RegistroConsultas
+from hashing import hashear_password, verificar_password, necesita_rehash
+from datetime import datetime, timedelta
+
+logger = logging.getLogger("practicas.database")
+
+TAMANO_PAGINA = 20
+
+# Valores de ofertas_practicas.estado (CHECK en config.init_database)
+ESTADOS_OFERTA = ("activa", "cerrada")
+
+# Hilos compartidos para consultas concurrentes (el cliente HTTP es thread-safe)
+_executor_consultas = ThreadPoolExecutor(max_workers=CONSULTAS_PARALELAS,
+                                         thread_name_prefix="consultas")
+
+# Perfiles de proyección: columnas que necesita cada tipo de vista.
+# Los textos largos (descripcion, requisitos) solo viajan en "detalle".
+PERFILES = {
+    "ofertas_practicas": {
+        "tarjeta": "id, titulo, empresa, area, modalidad, ubicacion, duracion, estado, created_at",
+        "tabla": "id, titulo, empresa, area, modalidad, estado, created_at",
+        "detalle": "*",
+    },
+    "postulaciones": {
+        "tarjeta": "id, oferta_id, estado, fecha_postulacion, "
+                   "ofertas_practicas(titulo, empresa, ubicacion)",
+        "tabla": "id, oferta_id, estado, fecha_postulacion, notas, "
+                 "ofertas_practicas(titulo, empresa, ubicacion), users(nombre, apellido, email)",
+        "detalle": "*, ofertas_practicas(*), users(nombre, apellido, email)",
+        "exportacion": "id, estado, fecha_postulacion, archivo_cv, notas, "
+                       "users(nombre, apellido, email, dni, carrera, universidad), "
+                       "ofertas_practicas!inner(titulo, empresa, area, modalidad, ubicacion)",
+    },
+}
+
+def _proyeccion(tabla, perfil):
+    """Columnas a seleccionar para un perfil de vista"""
+    try:
+        return PERFILES[tabla][perfil]
+    except KeyError:
+        raise ValueError(f"Perfil de proyección desconocido para {tabla}: {perfil}")
+
+# Compartida por todas las sesiones admin del proceso
+cache_estadisticas = CacheTTL(ttl=ESTADISTICAS_TTL)
+
+# Catálogo de ofertas: muchas lecturas, pocas escrituras
+cache_ofertas = CacheTTL(ttl=CATALOGO_TTL, max_entradas=CATALOGO_MAX_ENTRADAS)
+
+class Pagina:
+    """Página de resultados con el cursor para pedir la siguiente"""
+    def __init__(self, data, siguiente=None):
+        self.data = data
+        self.siguiente = siguiente
+
+def _codificar_cursor(valor):
+    """Genera el token opaco de la siguiente página"""
+    return base64.urlsafe_b64encode(json.dumps(valor).encode()).decode()
+
+def _decodificar_cursor(cursor):
+    """Recupera el valor guardado en un token de página"""
+    return json.loads(base64.urlsafe_b64decode(cursor.encode()))
+
+def _paginar(query, columna_fecha, limite=None, cursor=None):
+    """Pagina por keyset sobre (columna_fecha, id) en orden descendente"""
+    if cursor:
+        fecha, ultimo_id = _decodificar_cursor(cursor)
+        query = query.or_(
+            f'{columna_fecha}.lt."{fecha}",'
+            f'and({columna_fecha}.eq."{fecha}",id.lt.{ultimo_id})'
+        )
+    query = query.order(columna_fecha, desc=True).order("id", desc=True)
+    if not limite:
+        return Pagina(query.execute().data or [])
+
+    # Se pide una fila extra para saber si existe una página siguiente
+    filas = query.limit(limite + 1).execute().data or []
+    if len(filas) <= limite:
+        return Pagina(filas)
+    filas = filas[:limite]
+    return Pagina(filas, _codificar_cursor([filas[-1][columna_fecha], filas[-1]['id']]))
+
+def _paginar_por_desplazamiento(query, limite=None, cursor=None):
+    """Pagina resultados ordenados por relevancia, donde no hay una clave estable para keyset"""
+    if not limite:
+        return Pagina(query.execute().data or [])
+    
+    desplazamiento = _decodificar_cursor(cursor) if cursor else 0
+    filas = query.range(desplazamiento, desplazamiento + limite).execute().data or []
+    if len(filas) <= limite:
+        return Pagina(filas)
+    return Pagina(filas[:limite], _codificar_cursor(desplazamiento + limite))
+
+def _sin_acentos(texto):
+    """Equivalente a la función sin_acentos de Postgres (unaccent + lower)"""
+    normalizado = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in normalizado if not unicodedata.combining(c)).lower()
+
+def _filtrar_ofertas(query, filtros):
+    """Filtros exactos, salvo la ubicación: coincidencia parcial sobre la columna ubicacion_normalizada"""
+    for key, value in filtros.items():
+        if key == "ubicacion":
+            # Los comodines que escriba el usuario son literales (PostgREST traduce * a %)
+            texto = _sin_acentos(value.strip()).replace("*", "")
+            texto = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            query = query.ilike("ubicacion_normalizada", f"%{texto}%")
+        else:
+            query = query.eq(key, value)
+    return query
+
+def _retroceder(marca, segundos=SYNC_SOLAPE):
+    """Resta un margen a una marca de tiempo para no perder transacciones que confirmaron tarde"""
+    return (datetime.fromisoformat(marca) - timedelta(seconds=segundos)).isoformat()
+
+class Marca:
+    """Marca de agua de una sincronización incremental"""
+    def __init__(self, valor=None):
+        self.valor = valor
+        self.vista_en = time.monotonic()
+        # Mientras no esté confirmada se consulta con SYNC_SOLAPE segundos de margen
+        self.confirmada = False
+    
+    def avanzar(self, valor):
+        # Solo hacia adelante: con solape, un lote intermedio puede traer valores anteriores
+        if self.valor is None or valor > self.valor:
+            self.valor = valor
+            self.vista_en = time.monotonic()
+            self.confirmada = False
+    
+    def confirmar(self, inicio):
+        """Una sincronización iniciada SYNC_SOLAPE después de ver la marca ya cubrió los commits tardíos"""
+        if inicio - self.vista_en >= SYNC_SOLAPE:
+            self.confirmada = True
+
+class InstantaneaPostulaciones:
+    """Copia local de postulaciones (perfil "tabla") que se pone al día por deltas de updated_at"""
+    COLUMNAS = _proyeccion("postulaciones", "tabla") + ", updated_at"
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reiniciar()
+    
+    def reiniciar(self, marca_ofertas=None, marca_eliminaciones=None):
+        """Descarta la copia: la próxima sincronización trae la tabla completa"""
+        self.filas = {}
+        self.marca = Marca()
+        self.marca_ofertas = Marca(marca_ofertas)
+        self.marca_eliminaciones = Marca(marca_eliminaciones)
+        self.sincronizada_en = None
+    
+    def reemplazar(self, otra):
+        """Adopta una copia cargada aparte (requiere el lock)"""
+        self.filas = otra.filas
+        self.marca, self.marca_ofertas, self.marca_eliminaciones = (
+            otra.marca, otra.marca_ofertas, otra.marca_eliminaciones)
+        self.sincronizada_en = otra.sincronizada_en
+    
+    def necesita_recarga(self):
+        """Sin copia, o más vieja que la retención de eliminaciones: hay que traer la tabla completa"""
+        return (self.sincronizada_en is None
+                or time.monotonic() - self.sincronizada_en > SYNC_RETENCION)
+    
+    def contar(self, estado=None):
+        with self.lock:
+            return sum(1 for fila in self.filas.values() if not estado or fila['estado'] == estado)
+    
+    def pagina(self, estado=None, limite=None, cursor=None):
+        """Misma paginación y cursores que _paginar, resuelta sobre la copia local"""
+        with self.lock:
+            filas = [fila for fila in self.filas.values() if not estado or fila['estado'] == estado]
+        filas.sort(key=lambda fila: (fila['fecha_postulacion'], fila['id']), reverse=True)
+        if cursor:
+            limite_superior = tuple(_decodificar_cursor(cursor))
+            filas = [fila for fila in filas if (fila['fecha_postulacion'], fila['id']) < limite_superior]
+        
+        # Copias: la vista optimista del panel modifica sus filas
+        if not limite or len(filas) <= limite:
+            return Pagina([dict(fila) for fila in filas])
+        filas = [dict(fila) for fila in filas[:limite]]
+        return Pagina(filas, _codificar_cursor([filas[-1]['fecha_postulacion'], filas[-1]['id']]))
+
+# Compartida por todas las sesiones admin del proceso
+instantanea_postulaciones = InstantaneaPostulaciones()
+_recarga = None
+_recarga_lock = threading.Lock()
+
+def _recargar_instantanea():
+    try:
+        Database().sincronizar_postulaciones()
+    except Exception as e:
+        # La próxima vista vuelve a intentarlo; mientras tanto se pagina en el servidor
+        logger.warning(json.dumps({"evento": "recarga_instantanea_fallida",
+                                   "error": f"{type(e).__name__}: {e}"}, ensure_ascii=False))
+
+def recargar_en_segundo_plano():
+    """Lanza la carga completa de la instantánea en un hilo, si no hay una en curso"""
+    global _recarga
+    with _recarga_lock:
+        if _recarga is None or not _recarga.is_alive():
+            _recarga = threading.Thread(target=_recargar_instantanea, name="instantanea", daemon=True)
+            _recarga.start()
+    return _recarga
+
+class UsuarioDuplicado(Exception):
+    """El registro viola una restricción UNIQUE de users (campo: email o dni)"""
+    def __init__(self, campo):
+        super().__init__(f"Ya existe un usuario con ese {campo}")
+        self.campo = campo
+
+def _campo_duplicado(error):
+    """Columna UNIQUE violada según un error 23505 de Postgres, o None si es otro error"""
+    if getattr(error, 'code', None) != "23505":
+        return None
+    texto = f"{getattr(error, 'message', '')} {getattr(error, 'details', '')}"
+    for campo in ("email", "dni"):
+        if f"users_{campo}_key" in texto or f"({campo})" in texto:
+            return campo
+    return "registro"
+
+def _lotes(ids, tamano=LOTE_IDS):
+    """Divide una lista de ids en lotes para filtros in_"""
+    ids = list(ids)
+    for inicio in range(0, len(ids), tamano):
+        yield ids[inicio:inicio + tamano]
+
+def _congelar(valor):
+    """Convierte argumentos (dicts, listas) en una clave hashable"""
+    if isinstance(valor, dict):
+        return tuple(sorted((k, _congelar(v)) for k, v in valor.items()))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+def _lectura(metodo):
+    """Memoriza la lectura: llamadas idénticas en la misma instancia se ejecutan una sola vez"""
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        clave = (metodo.__name__, _congelar(args), _congelar(kwargs))
+        with self._memo_lock:
+            futuro = self._memo.get(clave)
+            propia = futuro is None
+            if propia:
+                futuro = self._memo[clave] = Future()
+        
+        # Si otro hilo ya la está ejecutando, se espera su resultado
+        if not propia:
+            return futuro.result()
+        try:
+            resultado = metodo(self, *args, **kwargs)
+        except Exception as e:
+            with self._memo_lock:
+                self._memo.pop(clave, None)
+            futuro.set_exception(e)
+            raise
+        futuro.set_result(resultado)
+        return resultado
+    return envoltura
+
+def _escritura(metodo):
+    """Toda escritura descarta las lecturas memorizadas"""
+    @functools.wraps(metodo)
+    def envoltura(self, *args, **kwargs):
+        try:
+            return metodo(self, *args, **kwargs)
+        finally:
+            self.limpiar_memo()
+    return envoltura
+
+class Database:
+    """Acceso a datos. Se crea una instancia por rerun: sus lecturas memorizadas viven lo que dura ese rerun"""
+    def __init__(self):
+        # Todas las consultas pasan por el cliente instrumentado y quedan en self.registro
+        self.registro = RegistroConsultas()
+        self.sb = ClienteInstrumentado(get_cliente(), self.registro)
+        self._memo = {}
+        self._memo_lock = threading.Lock()
+
+    def limpiar_memo(self):
+        """Olvida las lecturas memorizadas de esta instancia"""
+        with self._memo_lock:
+            self._memo.clear()
+
+    # CONSULTAS CONCURRENTES
+    def lanzar(self, consulta, *args, **kwargs):
+        """Inicia una consulta en segundo plano y retorna un Future"""
+        return _executor_consultas.submit(consulta, *args, **kwargs)
+
+    def en_paralelo(self, **consultas):
+        """Ejecuta consultas independientes a la vez (nombre=función sin argumentos) y retorna {nombre: resultado}"""
+        futuros = {nombre: self.lanzar(consulta) for nombre, consulta in consultas.items()}
+        return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+
+    # USUARIOS
+    @_escritura
+    def crear_usuario(self, email, password, role="estudiante", **datos):
+        """Crea usuario con contraseña hasheada"""
+        hashed = hashear_password(password)
+        data = {
+            "email": email,
+            "password_hash": hashed,
+            "role": role,
+            **datos
+        }
+        # Una sola inserción: email y dni duplicados los detectan las restricciones UNIQUE
+        try:
+            return self.sb.table("users").insert(data).execute()
+        except Exception as e:
+            campo = _campo_duplicado(e)
+            if campo:
+                raise UsuarioDuplicado(campo) from e
+            raise
+
+    @_escritura
+    def actualizar_usuario(self, user_id, datos):
+        """Actualiza datos del perfil de un usuario"""
+        return self.sb.table("users").update(datos).eq("id", user_id).execute()
+
+    @_lectura
+    def listar_usuarios(self):
+        """Lista usuarios para el panel admin (sin el hash de contraseña)"""
+        return self.sb.table("users").select("id, nombre, apellido, email, role, created_at").execute()
+
+    @_lectura
+    def obtener_usuario_por_email(self, email):
+        """Busca usuario por email"""
+        return self.sb.table("users").select("*").eq("email", email).execute()
+
+    def verificar_password(self, password, hashed):
+        """Verifica contraseña"""
+        return verificar_password(password, hashed)
+
+    @_escritura
+    def verificar_credenciales(self, user, password):
+        """Verifica la contraseña y, si el costo del hash cambió, lo regenera de forma transparente"""
+        if not verificar_password(password, user['password_hash']):
+            return False
+        
+        if necesita_rehash(user['password_hash']):
+            try:
+                nuevo_hash = hashear_password(password)
+                self.sb.table("users").update({"password_hash": nuevo_hash}).eq("id", user['id']).execute()
+                user['password_hash'] = nuevo_hash
+            except Exception as e:
+                logger.warning(json.dumps({"evento": "rehash_fallido", "user_id": user['id'],
+                                           "error": f"{type(e).__name__}: {e}"}, ensure_ascii=False))
+        return True
+
+    # OFERTAS
+    @_escritura
+    def crear_oferta(self, datos):
+        """Crea nueva oferta de práctica"""
+        resultado = self.sb.table("ofertas_practicas").insert(datos).execute()
+        cache_ofertas.invalidar()
+        cache_estadisticas.invalidar()
+        return resultado
+
+    @_escritura
+    def crear_ofertas(self, lista_datos):
+        """Inserta varias ofertas en una sola sentencia (sin devolver las filas)"""
+        resultado = self.sb.table("ofertas_practicas").insert(lista_datos, returning="minimal").execute()
+        cache_ofertas.invalidar()
+        cache_estadisticas.invalidar()
+        return resultado
+
+    @_lectura
+    def claves_ofertas(self, titulos):
+        """(titulo, empresa, area) de las ofertas con alguno de esos títulos, sin caché"""
+        resultado = self.sb.table("ofertas_practicas").select("titulo, empresa, area").in_(
+            "titulo", list(titulos)).execute()
+        return [(o["titulo"], o["empresa"], o["area"]) for o in resultado.data]
+
+    @_lectura
+    def obtener_ofertas(self, filtros=None, limite=None, cursor=None, perfil="tarjeta", busqueda=None):
+        """Obtiene ofertas con filtros opcionales; con busqueda, por texto completo y relevancia"""
+        filtros = {key: value for key, value in (filtros or {}).items() if value}
+        busqueda = (busqueda or "").strip()
+        if busqueda:
+            clave = ("busqueda", busqueda, tuple(sorted(filtros.items())), limite, cursor)
+            return cache_ofertas.obtener(
+                clave, lambda: self._buscar_ofertas(busqueda, filtros, limite, cursor))
+        
+        clave = ("lista", tuple(sorted(filtros.items())), limite, cursor, perfil)
+        return cache_ofertas.obtener(
+            clave, lambda: self._consultar_ofertas(filtros, limite, cursor, perfil))
+
+    def _buscar_ofertas(self, texto, filtros, limite, cursor):
+        """Búsqueda sin acentos sobre el índice GIN de ofertas (función buscar_ofertas en Postgres)"""
+        query = _filtrar_ofertas(self.sb.rpc("buscar_ofertas", {"texto": texto}), filtros)
+        query = query.order("rango", desc=True).order("created_at", desc=True).order("id", desc=True)
+        return _paginar_por_desplazamiento(query, limite, cursor)
+
+    def _consultar_ofertas(self, filtros, limite, cursor, perfil):
+        """Consulta el catálogo en Supabase (sin cache)"""
+        query = self.sb.table("ofertas_practicas").select(_proyeccion("ofertas_practicas", perfil))
+        query = _filtrar_ofertas(query, filtros)
+        return _paginar(query, "created_at", limite, cursor)
+
+    @_lectura
+    def obtener_oferta_por_id(self, oferta_id, perfil="detalle"):
+        """Obtiene una oferta específica"""
+        return cache_ofertas.obtener(
+            ("id", oferta_id, perfil),
+            lambda: self.sb.table("ofertas_practicas")
+                .select(_proyeccion("ofertas_practicas", perfil))
+                .eq("id", oferta_id)
+                .execute())
+
+    @_escritura
+    def actualizar_oferta(self, oferta_id, datos):
+        """Actualiza oferta"""
+        resultado = self.sb.table("ofertas_practicas").update(datos).eq("id", oferta_id).execute()
+        cache_ofertas.invalidar()
+        return resultado
+
+    @_escritura
+    def eliminar_oferta(self, oferta_id):
+        """Elimina oferta"""
+        resultado = self.sb.table("ofertas_practicas").delete().eq("id", oferta_id).execute()
+        cache_ofertas.invalidar()
+        cache_estadisticas.invalidar()
+        return resultado
+
+    # POSTULACIONES
+    @_escritura
+    def crear_postulacion(self, user_id, oferta_id, archivo_cv=None):
+        """Crea postulación"""
+        data = {
+            "user_id": user_id,
+            "oferta_id": oferta_id,
+            "archivo_cv": archivo_cv
+        }
+        resultado = self.sb.table("postulaciones").insert(data).execute()
+        cache_estadisticas.invalidar()
+        return resultado
+
+    @_lectura
+    def obtener_postulaciones_por_usuario(self, user_id, perfil="tarjeta"):
+        """Obtiene postulaciones de un estudiante"""
+        return self.sb.table("postulaciones")\
+            .select(_proyeccion("postulaciones", perfil))\
+            .eq("user_id", user_id)\
+            .execute()
+
+    @_lectura
+    def obtener_ofertas_postuladas(self, user_id):
+        """Retorna el conjunto de oferta_id a los que el usuario ya postuló (una sola consulta)"""
+        resultado = self.sb.table("postulaciones")\
+            .select("oferta_id")\
+            .eq("user_id", user_id)\
+            .execute()
+        return {fila['oferta_id'] for fila in resultado.data or []}
+
+    @_lectura
+    def obtener_postulaciones_admin(self, estado=None, limite=None, cursor=None, perfil="tabla"):
+        """Obtiene postulaciones para admin, filtradas por estado en el servidor y paginadas"""
+        query = self.sb.table("postulaciones").select(_proyeccion("postulaciones", perfil))
+        if estado:
+            query = query.eq("estado", estado)
+        return _paginar(query, "fecha_postulacion", limite, cursor)
+
+    def iterar_postulaciones_admin(self, estado=None, desde=None, hasta=None, empresa=None,
+                                   tamano_pagina=1000, perfil="exportacion"):
+        """Recorre todas las postulaciones que cumplen los filtros, una página en memoria a la vez"""
+        cursor = None
+        while True:
+            query = self.sb.table("postulaciones").select(_proyeccion("postulaciones", perfil))
+            if estado:
+                query = query.eq("estado", estado)
+            if desde:
+                query = query.gte("fecha_postulacion", desde)
+            if hasta:
+                query = query.lt("fecha_postulacion", hasta)
+            if empresa:
+                query = query.eq("ofertas_practicas.empresa", empresa)
+            
+            pagina = _paginar(query, "fecha_postulacion", tamano_pagina, cursor)
+            yield pagina.data
+            if not pagina.siguiente:
+                return
+            cursor = pagina.siguiente
+
+    @_lectura
+    def contar_postulaciones(self, estado=None):
+        """Cuenta postulaciones sin descargar filas"""
+        filtros = {"estado": estado} if estado else {}
+        return self._contar("postulaciones", **filtros)
+
+    @_escritura
+    def actualizar_estado_postulacion(self, postulacion_id, nuevo_estado):
+        """Actualiza estado de postulación"""
+        resultado = self.sb.table("postulaciones")\
+            .update({"estado": nuevo_estado})\
+            .eq("id", postulacion_id)\
+            .execute()
+        cache_estadisticas.invalidar()
+        return resultado
+
+    # OPERACIONES MASIVAS
+    @_escritura
+    def actualizar_estado_postulaciones(self, postulacion_ids, nuevo_estado):
+        """Actualiza el estado de varias postulaciones con un filtro in_ por lote"""
+        filas = []
+        for lote in _lotes(postulacion_ids):
+            resultado = self.sb.table("postulaciones")\
+                .update({"estado": nuevo_estado})\
+                .in_("id", lote)\
+                .execute()
+            filas.extend(resultado.data or [])
+        cache_estadisticas.invalidar()
+        return filas
+
+    @_escritura
+    def eliminar_postulaciones(self, postulacion_ids):
+        """Elimina varias postulaciones con un filtro in_ por lote"""
+        filas = []
+        for lote in _lotes(postulacion_ids):
+            resultado = self.sb.table("postulaciones").delete().in_("id", lote).execute()
+            filas.extend(resultado.data or [])
+        cache_estadisticas.invalidar()
+        return filas
+
+    # MÉTODOS NUEVOS PARA EDITAR/ELIMINAR POSTULACIONES
+    @_escritura
+    def actualizar_postulacion(self, postulacion_id, datos):
+        """Actualiza datos de una postulación"""
+        return self.sb.table("postulaciones").update(datos).eq("id", postulacion_id).execute()
+
+    @_escritura
+    def eliminar_postulacion(self, postulacion_id):
+        """Elimina una postulación"""
+        resultado = self.sb.table("postulaciones").delete().eq("id", postulacion_id).execute()
+        cache_estadisticas.invalidar()
+        return resultado
+
+    @_lectura
+    def obtener_postulacion_por_id(self, postulacion_id):
+        """Obtiene una postulación específica"""
+        return self.sb.table("postulaciones").select("*").eq("id", postulacion_id).execute()
+
+    # SINCRONIZACIÓN INCREMENTAL
+    @_lectura
+    def sincronizar_postulaciones(self, completa=False):
+        """Pone al día la instantánea local trayendo solo lo modificado o eliminado desde la última marca"""
+        instantanea = instantanea_postulaciones
+        if completa or instantanea.necesita_recarga():
+            self._recargar(instantanea)
+        with instantanea.lock:
+            self._aplicar_cambios(instantanea)
+        return instantanea
+
+    def instantanea_al_dia(self):
+        """Instantánea puesta al día por delta, o None si todavía no está lista para paginar en memoria.
+
+        La carga completa nunca se hace en el render: se lanza en segundo plano y, mientras
+        tanto (o si otra sesión está sincronizando), el panel pagina en el servidor.
+        """
+        instantanea = instantanea_postulaciones
+        if instantanea.necesita_recarga():
+            recargar_en_segundo_plano()
+            return None
+        if not instantanea.lock.acquire(blocking=False):
+            return None
+        try:
+            self._aplicar_cambios(instantanea)
+        finally:
+            instantanea.lock.release()
+        return instantanea
+
+    def _recargar(self, instantanea):
+        """Carga completa en una copia aparte; el lock solo se toma para reemplazar la anterior"""
+        # Marcas tomadas antes de la carga. Nacen sin confirmar: una transacción iniciada
+        # antes de la carga pero confirmada después tiene un updated_at anterior a ellas
+        nueva = InstantaneaPostulaciones()
+        nueva.reiniciar(
+            marca_ofertas=self._ultima_marca("ofertas_practicas", "updated_at"),
+            marca_eliminaciones=self._ultima_marca("eliminaciones", "eliminado_en", tabla="postulaciones")
+        )
+        self._aplicar_cambios(nueva)
+        with instantanea.lock:
+            instantanea.reemplazar(nueva)
+
+    def _aplicar_cambios(self, instantanea):
+        """Trae los cambios, eliminaciones y ofertas modificadas desde las marcas (requiere el lock)"""
+        inicio = time.monotonic()
+        for lote in self._cambios("postulaciones", instantanea.COLUMNAS, "updated_at", "id",
+                                  instantanea.marca):
+            for fila in lote:
+                instantanea.filas[fila['id']] = fila
+            instantanea.marca.avanzar(lote[-1]['updated_at'])
+        
+        for lote in self._cambios("eliminaciones", "fila_id, eliminado_en", "eliminado_en", "fila_id",
+                                  instantanea.marca_eliminaciones, tabla="postulaciones"):
+            for fila in lote:
+                instantanea.filas.pop(fila['fila_id'], None)
+            instantanea.marca_eliminaciones.avanzar(lote[-1]['eliminado_en'])
+        
+        # Los datos embebidos de la oferta cambian sin tocar la postulación
+        for lote in self._cambios("ofertas_practicas", "id, titulo, empresa, ubicacion, updated_at",
+                                  "updated_at", "id", instantanea.marca_ofertas):
+            ofertas = {oferta['id']: oferta for oferta in lote}
+            for fila in instantanea.filas.values():
+                oferta = ofertas.get(fila['oferta_id'])
+                if oferta:
+                    fila['ofertas_practicas'] = {campo: oferta[campo]
+                                                 for campo in ("titulo", "empresa", "ubicacion")}
+            instantanea.marca_ofertas.avanzar(lote[-1]['updated_at'])
+        
+        for marca in (instantanea.marca, instantanea.marca_eliminaciones, instantanea.marca_ofertas):
+            marca.confirmar(inicio)
+        instantanea.sincronizada_en = time.monotonic()
+
+    def _cambios(self, origen, columnas, columna_marca, clave, marca, **filtros):
+        """Filas posteriores a la marca, en lotes ascendentes por keyset"""
+        # El límite se fija al empezar: la marca avanza mientras se recorren los lotes
+        desde, confirmada = marca.valor, marca.confirmada
+        ultimo = None
+        while True:
+            query = self.sb.table(origen).select(columnas)
+            for columna, valor in filtros.items():
+                query = query.eq(columna, valor)
+            if desde and confirmada:
+                query = query.gt(columna_marca, desde)
+            elif desde:
+                query = query.gte(columna_marca, _retroceder(desde))
+            if ultimo:
+                query = query.or_(
+                    f'{columna_marca}.gt."{ultimo[0]}",'
+                    f'and({columna_marca}.eq."{ultimo[0]}",{clave}.gt.{ultimo[1]})'
+                )
+            filas = query.order(columna_marca).order(clave).limit(SYNC_LOTE).execute().data or []
+            if filas:
+                yield filas
+            if len(filas) < SYNC_LOTE:
+                return
+            ultimo = (filas[-1][columna_marca], filas[-1][clave])
+
+    def _ultima_marca(self, origen, columna_marca, **filtros):
+        """Valor más reciente de columna_marca, o None si la tabla está vacía"""
+        query = self.sb.table(origen).select(columna_marca)
+        for columna, valor in filtros.items():
+            query = query.eq(columna, valor)
+        filas = query.order(columna_marca, desc=True).limit(1).execute().data
+        return filas[0][columna_marca] if filas else None
+
+    def _contar(self, tabla, **filtros):
+        """Cuenta filas: el total llega en Content-Range y solo viaja un id"""
+        query = self.sb.table(tabla).select("id", count="exact")
+        for key, value in filtros.items():
+            query = query.eq(key, value)
+        return query.limit(1).execute().count or 0
+
+    # ESTADÍSTICAS
+    @_lectura
+    def obtener_resumen_por_oferta(self):
+        """Postulaciones por oferta y estado, agregadas en Postgres (vista resumen_postulaciones_oferta)"""
+        return self.sb.table("resumen_postulaciones_oferta").select("*").execute()
+
+    @_lectura
+    def obtener_postulaciones_por_semana(self):
+        """Volumen semanal de postulaciones (vista postulaciones_por_semana)"""
+        return self.sb.table("postulaciones_por_semana").select("*").order("semana").execute()
+
+    @_lectura
+    def get_estadisticas(self):
+        """Obtiene estadísticas para el panel admin (cacheadas unos segundos)"""
+        return cache_estadisticas.obtener("admin", self._calcular_estadisticas)
+
+    def _calcular_estadisticas(self):
+        """Todos los contadores en un solo viaje mediante la función estadisticas_admin"""
+        stats = self.sb.rpc("estadisticas_admin", {}).execute().data[0]
+        return {
+            "total_ofertas": stats.get("total_ofertas", 0) or 0,
+            "total_postulaciones": stats.get("total_postulaciones", 0) or 0,
+            "pendientes": stats.get("pendientes", 0) or 0
+        }
@@ -0,0 +1,118 @@
+import argparse
+import csv
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from database import Database
+from config import EXPORTACION_DIRECTORIO, EXPORTACION_TTL
+
+# Columnas planas del reporte: (nombre en el archivo, relación embebida, campo)
+COLUMNAS = [
+    ("id", None, "id"),
+    ("estado", None, "estado"),
+    ("fecha_postulacion", None, "fecha_postulacion"),
+    ("archivo_cv", None, "archivo_cv"),
+    ("notas", None, "notas"),
+    ("estudiante_nombre", "users", "nombre"),
+    ("estudiante_apellido", "users", "apellido"),
+    ("estudiante_email", "users", "email"),
+    ("estudiante_dni", "users", "dni"),
+    ("estudiante_carrera", "users", "carrera"),
+    ("estudiante_universidad", "users", "universidad"),
+    ("oferta_titulo", "ofertas_practicas", "titulo"),
+    ("oferta_empresa", "ofertas_practicas", "empresa"),
+    ("oferta_area", "ofertas_practicas", "area"),
+    ("oferta_modalidad", "ofertas_practicas", "modalidad"),
+    ("oferta_ubicacion", "ofertas_practicas", "ubicacion"),
+]
+NOMBRES = [nombre for nombre, _, _ in COLUMNAS]
+
+def aplanar(post):
+    """Convierte una postulación con relaciones embebidas en una fila plana"""
+    fila = {}
+    for nombre, relacion, campo in COLUMNAS:
+        origen = (post.get(relacion) or {}) if relacion else post
+        valor = origen.get(campo)
+        fila[nombre] = None if valor is None else str(valor)
+    return fila
+
+def _escribir_csv(paginas, destino):
+    with open(destino, "w", newline="", encoding="utf-8") as f:
+        escritor = csv.DictWriter(f, fieldnames=NOMBRES)
+        escritor.writeheader()
+        for pagina in paginas:
+            escritor.writerows(aplanar(post) for post in pagina)
+            yield len(pagina)
+
+def _escribir_parquet(paginas, destino):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("La exportación a Parquet requiere pyarrow (pip install pyarrow)")
+    
+    esquema = pa.schema([(nombre, pa.string()) for nombre in NOMBRES])
+    with pq.ParquetWriter(destino, esquema) as escritor:
+        # Cada página se escribe como un row group y se descarta
+        for pagina in paginas:
+            if pagina:
+                escritor.write_table(pa.Table.from_pylist([aplanar(p) for p in pagina], schema=esquema))
+            yield len(pagina)
+
+def exportar_postulaciones(db, destino, formato="csv", tamano_pagina=1000, al_avanzar=None,
+                           max_filas=None, **filtros):
+    """Escribe las postulaciones filtradas en CSV o Parquet página a página; retorna el total de filas"""
+    if max_filas:
+        # Se pide una fila de más para saber si se supera el tope sin contar aparte
+        tamano_pagina = min(tamano_pagina, max_filas + 1)
+    paginas = db.iterar_postulaciones_admin(tamano_pagina=tamano_pagina, **filtros)
+    escribir = {"csv": _escribir_csv, "parquet": _escribir_parquet}[formato]
+    
+    total = 0
+    for filas in escribir(paginas, destino):
+        total += filas
+        if max_filas and total > max_filas:
+            raise ValueError(f"La exportación supera {max_filas} filas: usa python exportar.py o ajusta los filtros")
+        if al_avanzar:
+            al_avanzar(total)
+    return total
+
+def archivo_temporal(formato, directorio=EXPORTACION_DIRECTORIO, ttl=EXPORTACION_TTL):
+    """Ruta nueva para una exportación; antes borra las de más de `ttl` segundos (sesiones cerradas)"""
+    os.makedirs(directorio, exist_ok=True)
+    limite = time.time() - ttl
+    for entrada in os.scandir(directorio):
+        try:
+            if entrada.is_file() and entrada.stat().st_mtime < limite:
+                os.remove(entrada.path)
+        except FileNotFoundError:
+            pass  # Otra sesión la borró primero
+    descriptor, ruta = tempfile.mkstemp(dir=directorio, suffix=f".{formato}")
+    os.close(descriptor)
+    return ruta
+
+def fin_de_rango(hasta):
+    """Convierte la fecha final inclusiva en el límite exclusivo que usa la consulta"""
+    return (hasta + timedelta(days=1)).isoformat() if hasta else None
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta postulaciones con datos del estudiante y la oferta")
+    parser.add_argument("destino", help="Archivo .csv o .parquet")
+    parser.add_argument("--estado", choices=["pendiente", "aprobado", "rechazado"])
+    parser.add_argument("--desde", type=date.fromisoformat, help="Fecha inicial (AAAA-MM-DD)")
+    parser.add_argument("--hasta", type=date.fromisoformat, help="Fecha final inclusiva (AAAA-MM-DD)")
+    parser.add_argument("--empresa")
+    parser.add_argument("--pagina", type=int, default=1000, help="Filas por consulta")
+    args = parser.parse_args()
+    
+    formato = "parquet" if args.destino.endswith(".parquet") else "csv"
+    total = exportar_postulaciones(
+        Database(), args.destino, formato, tamano_pagina=args.pagina,
+        al_avanzar=lambda n: print(f"  {n} filas escritas"),
+        estado=args.estado, desde=args.desde.isoformat() if args.desde else None,
+        hasta=fin_de_rango(args.hasta), empresa=args.empresa)
+    print(f"✅ {total} postulaciones exportadas a {args.destino}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import bcrypt
+from config import BCRYPT_ROUNDS, BCRYPT_WORKERS, BCRYPT_MAX_COLA
+
+class HashingSaturado(Exception):
+    """Hay demasiados hashes bcrypt en curso o en cola"""
+
+# bcrypt libera el GIL: el pool limita cuántos núcleos se dedican a hashear
+_executor = ThreadPoolExecutor(max_workers=BCRYPT_WORKERS, thread_name_prefix="bcrypt")
+_cupos = threading.BoundedSemaphore(BCRYPT_WORKERS + BCRYPT_MAX_COLA)
+
+def _ejecutar(funcion, *args):
+    """Ejecuta trabajo bcrypt en el pool; rechaza de inmediato si la cola está llena"""
+    if not _cupos.acquire(blocking=False):
+        raise HashingSaturado("Servidor ocupado verificando contraseñas")
+    try:
+        futuro = _executor.submit(funcion, *args)
+    except Exception:
+        _cupos.release()
+        raise
+    futuro.add_done_callback(lambda _: _cupos.release())
+    return futuro.result()
+
+def _hashpw(password):
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds=BCRYPT_ROUNDS)).decode()
+
+def _checkpw(password, hashed):
+    return bcrypt.checkpw(password.encode(), hashed.encode())
+
+def hashear_password(password):
+    """Genera el hash bcrypt con el costo configurado"""
+    return _ejecutar(_hashpw, password)
+
+def verificar_password(password, hashed):
+    """Verifica una contraseña contra su hash"""
+    return _ejecutar(_checkpw, password, hashed)
+
+def costo_hash(hashed):
+    """Factor de costo de un hash bcrypt ($2b$<costo>$...)"""
+    return int(hashed.split("$")[2])
+
+def necesita_rehash(hashed):
+    """True si el hash se generó con un costo distinto al configurado"""
+    return costo_hash(hashed) != BCRYPT_ROUNDS
@@ -0,0 +1,228 @@
+import argparse
+import collections
+import contextlib
+import json
+import os
+import sys
+import time
+import pandas as pd
+from postgrest.exceptions import APIError
+from database import Database, ESTADOS_OFERTA
+from resiliencia import es_transitorio
+
+# Columnas de ofertas_practicas que se aceptan en el archivo (ver config.init_database)
+COLUMNAS = ["titulo", "empresa", "area", "duracion", "modalidad", "ubicacion",
+            "requisitos", "descripcion", "estado"]
+OBLIGATORIAS = ["titulo", "empresa", "area"]
+MODALIDADES = ["Presencial", "Remoto", "Híbrido"]
+
+class ResumenImportacion:
+    """Resultado de una importación: filas insertadas, errores por fila y punto de reanudación"""
+    def __init__(self, desde=0):
+        self.insertadas = 0
+        self.omitidas = 0
+        self.errores = []
+        self.siguiente_fila = desde
+        self.completa = False
+        self.interrumpida = None
+        self._inicio = time.perf_counter()
+
+    @property
+    def segundos(self):
+        return time.perf_counter() - self._inicio
+
+    @property
+    def filas_por_segundo(self):
+        return self.insertadas / self.segundos if self.segundos else 0.0
+
+def _abrir(origen):
+    """Acepta una ruta o un objeto tipo archivo (p. ej. el archivo subido en el panel)"""
+    return contextlib.nullcontext(origen) if hasattr(origen, "read") else open(origen, encoding="utf-8")
+
+def _leer_jsonl(origen):
+    with _abrir(origen) as f:
+        for linea in f:
+            if linea.strip():
+                yield json.loads(linea)
+
+def _leer_json(origen):
+    # Un arreglo JSON no se puede leer por partes: se carga y se recorre en bloques
+    with _abrir(origen) as f:
+        yield from json.load(f)
+
+def _en_bloques(registros, tamano_bloque):
+    """Agrupa registros en DataFrames de tipo object: las claves ausentes quedan como NaN
+    (no como el texto "nan") y los números no pasan a float"""
+    bloque = []
+    for registro in registros:
+        bloque.append(registro)
+        if len(bloque) == tamano_bloque:
+            yield pd.DataFrame(bloque, dtype=object)
+            bloque = []
+    if bloque:
+        yield pd.DataFrame(bloque, dtype=object)
+
+def leer_bloques(origen, formato, tamano_bloque):
+    """Lee el archivo en bloques de DataFrames sin cargarlo entero (CSV y JSON Lines)"""
+    if formato == "csv":
+        return pd.read_csv(origen, chunksize=tamano_bloque, dtype=str, keep_default_na=False)
+    if formato == "jsonl":
+        return _en_bloques(_leer_jsonl(origen), tamano_bloque)
+    if formato == "json":
+        return _en_bloques(_leer_json(origen), tamano_bloque)
+    raise ValueError(f"Formato no soportado: {formato}")
+
+def formato_de(nombre):
+    """Deduce el formato por la extensión del archivo"""
+    extension = os.path.splitext(nombre)[1].lower().lstrip(".")
+    return {"csv": "csv", "json": "json", "jsonl": "jsonl", "ndjson": "jsonl"}.get(extension, extension)
+
+def validar_columnas(columnas):
+    """Retorna las columnas desconocidas y las obligatorias que faltan"""
+    desconocidas = [c for c in columnas if c not in COLUMNAS]
+    faltantes = [c for c in OBLIGATORIAS if c not in columnas]
+    return desconocidas, faltantes
+
+def validar_fila(fila):
+    """Normaliza una fila; retorna (datos, None) o (None, mensaje de error)"""
+    datos = {c: str(fila[c]).strip() for c in COLUMNAS if c in fila and pd.notna(fila[c])}
+    datos = {c: v for c, v in datos.items() if v}
+    
+    faltantes = [c for c in OBLIGATORIAS if not datos.get(c)]
+    if faltantes:
+        return None, f"Faltan campos obligatorios: {', '.join(faltantes)}"
+    if datos.get("modalidad") and datos["modalidad"] not in MODALIDADES:
+        return None, f"Modalidad inválida: {datos['modalidad']}"
+    
+    datos.setdefault("estado", "activa")
+    if datos["estado"] not in ESTADOS_OFERTA:
+        return None, f"Estado inválido: {datos['estado']}"
+    return datos, None
+
+def _omitir_existentes(db, lote, resumen):
+    """Quita del lote las filas que ya están en la base con el mismo titulo, empresa y area.
+
+    Al reanudar, el primer lote es el que estaba en vuelo cuando se cortó la conexión: el
+    servidor pudo haberlo confirmado sin que llegara la respuesta. Una oferta idéntica que
+    ya existiera antes de la importación también se omite."""
+    existentes = collections.Counter(db.claves_ofertas(tuple(sorted({d["titulo"] for _, d in lote}))))
+    pendientes = []
+    for fila, datos in lote:
+        clave = (datos["titulo"], datos["empresa"], datos["area"])
+        if existentes[clave]:
+            existentes[clave] -= 1
+            resumen.omitidas += 1
+        else:
+            pendientes.append((fila, datos))
+    return pendientes
+
+def _insertar_lote(db, lote, resumen):
+    """Inserta un lote en un solo viaje; si el servidor lo rechaza, aísla las filas con error"""
+    resumen.siguiente_fila = lote[0][0]
+    try:
+        db.crear_ofertas([datos for _, datos in lote])
+        resumen.insertadas += len(lote)
+        return
+    except APIError as e:
+        # Un fallo pasajero no es culpa de ninguna fila: interrumpe para reanudar desde aquí
+        if es_transitorio(e):
+            raise
+    
+    for fila, datos in lote:
+        resumen.siguiente_fila = fila
+        try:
+            db.crear_ofertas([datos])
+            resumen.insertadas += 1
+        except APIError as e:
+            if es_transitorio(e):
+                raise
+            resumen.errores.append((fila, e.message or str(e)))
+
+def importar_ofertas(db, origen, formato, tamano_lote=100, desde=0, al_avanzar=None):
+    """Valida e inserta ofertas por lotes; si se interrumpe, resumen.siguiente_fila indica dónde reanudar"""
+    # Las filas se numeran desde 0 sin contar el encabezado
+    resumen = ResumenImportacion(desde)
+    fila_actual = 0
+    verificar = desde > 0
+    
+    for bloque in leer_bloques(origen, formato, tamano_lote):
+        if fila_actual == 0:
+            desconocidas, faltantes = validar_columnas(list(bloque.columns))
+            if faltantes:
+                raise ValueError(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+            if desconocidas:
+                resumen.errores.append((None, f"Columnas ignoradas: {', '.join(desconocidas)}"))
+        
+        lote = []
+        for fila in bloque.to_dict("records"):
+            if fila_actual >= desde:
+                datos, error = validar_fila(fila)
+                if error:
+                    resumen.errores.append((fila_actual, error))
+                else:
+                    lote.append((fila_actual, datos))
+            fila_actual += 1
+        
+        if lote:
+            try:
+                if verificar:
+                    lote = _omitir_existentes(db, lote, resumen)
+                    verificar = False
+                if lote:
+                    _insertar_lote(db, lote, resumen)
+            except Exception as e:
+                # Error de conexión u otro fallo no atribuible a una fila: se puede reanudar
+                resumen.interrumpida = str(e)
+                return resumen
+        
+        resumen.siguiente_fila = max(fila_actual, desde)
+        if al_avanzar:
+            al_avanzar(resumen)
+    
+    resumen.completa = True
+    return resumen
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa ofertas de prácticas desde CSV, JSON o JSON Lines")
+    parser.add_argument("archivo")
+    parser.add_argument("--lote", type=int, default=100, help="Filas por inserción")
+    parser.add_argument("--desde", type=int, default=None,
+                        help="Fila desde la que empezar (por defecto, la guardada en el archivo de progreso)")
+    args = parser.parse_args()
+    
+    progreso = f"{args.archivo}.progreso"
+    desde = args.desde
+    if desde is None:
+        desde = 0
+        if os.path.exists(progreso):
+            with open(progreso) as f:
+                desde = int(f.read())
+    if desde:
+        print(f"↪️ Reanudando desde la fila {desde}")
+    
+    def guardar_progreso(resumen):
+        with open(progreso, "w") as f:
+            f.write(str(resumen.siguiente_fila))
+        print(f"  {resumen.siguiente_fila} filas procesadas | {resumen.insertadas} insertadas | "
+              f"{resumen.filas_por_segundo:.0f} filas/s")
+    
+    resumen = importar_ofertas(Database(), args.archivo, formato_de(args.archivo),
+                               tamano_lote=args.lote, desde=desde, al_avanzar=guardar_progreso)
+    
+    for fila, error in resumen.errores:
+        print(f"⚠️ Fila {fila}: {error}" if fila is not None else f"⚠️ {error}")
+    print(f"✅ {resumen.insertadas} ofertas insertadas en {resumen.segundos:.1f} s "
+          f"({resumen.filas_por_segundo:.0f} filas/s), {len(resumen.errores)} errores")
+    if resumen.omitidas:
+        print(f"↪️ {resumen.omitidas} ofertas omitidas: ya se habían insertado antes de la interrupción")
+    
+    if not resumen.completa:
+        guardar_progreso(resumen)
+        print(f"❌ Importación interrumpida: {resumen.interrumpida}")
+        print(f"   Vuelve a ejecutar el comando para reanudar desde la fila {resumen.siguiente_fila}")
+        sys.exit(1)
+    if os.path.exists(progreso):
+        os.remove(progreso)
+
+if __name__ == "__main__":
+    main()
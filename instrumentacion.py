@@ -0,0 +1,136 @@
+import json
+import logging
+import threading
+import time
+from config import bytes_ultima_respuesta, PRESUPUESTO_CONSULTAS
+import resiliencia
+
+logger = logging.getLogger("practicas.consultas")
+
+# Métodos del constructor que se anotan como filtros (solo columna y operador, nunca valores)
+_FILTROS = {"eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is_", "in_",
+            "contains", "text_search", "match", "or_", "order", "limit", "range"}
+_OPERACIONES = {"select", "insert", "update", "upsert", "delete"}
+
+# Funciones STABLE de config.init_database: se pueden reintentar como cualquier lectura
+RPC_SOLO_LECTURA = {"estadisticas_admin", "buscar_ofertas"}
+
+class RegistroConsultas:
+    """Consultas ejecutadas por una instancia de Database (una por rerun)"""
+    def __init__(self):
+        self.consultas = []
+        self._lock = threading.Lock()
+
+    def registrar(self, consulta):
+        with self._lock:
+            self.consultas.append(consulta)
+        logger.debug(json.dumps({"evento": "consulta", **consulta}, ensure_ascii=False))
+
+    def totales(self):
+        with self._lock:
+            consultas = list(self.consultas)
+        return {
+            "consultas": len(consultas),
+            "milisegundos": round(sum(c['milisegundos'] for c in consultas), 1),
+            "filas": sum(c['filas'] for c in consultas),
+            "bytes": sum(c['bytes'] for c in consultas),
+            "errores": sum(1 for c in consultas if c['error']),
+        }
+
+    def excede_presupuesto(self):
+        return bool(PRESUPUESTO_CONSULTAS) and len(self.consultas) > PRESUPUESTO_CONSULTAS
+
+class ConsultaInstrumentada:
+    """Envuelve un constructor de PostgREST: anota filtros, mide su execute() y lo protege (resiliencia)"""
+    def __init__(self, constructor, registro, recurso, operacion):
+        self._constructor = constructor
+        self._registro = registro
+        self._recurso = recurso
+        self._operacion = operacion
+        self._filtros = []
+
+    def __getattr__(self, nombre):
+        atributo = getattr(self._constructor, nombre)
+        if not callable(atributo):
+            return atributo
+
+        def llamada(*args, **kwargs):
+            resultado = atributo(*args, **kwargs)
+            self._anotar(nombre, args)
+            # Los métodos encadenables devuelven otro constructor: se sigue envolviendo
+            if hasattr(resultado, "execute"):
+                self._constructor = resultado
+                return self
+            return resultado
+        return llamada
+
+    def _anotar(self, nombre, args):
+        if nombre in _OPERACIONES:
+            self._operacion = nombre
+        elif nombre == "in_":
+            self._filtros.append(f"in({args[0]}, {len(args[1])} valores)")
+        elif nombre == "or_":
+            self._filtros.append("or(…)")
+        elif nombre in ("limit", "range"):
+            self._filtros.append(f"{nombre}({', '.join(map(str, args))})")
+        elif nombre in _FILTROS:
+            self._filtros.append(f"{nombre.rstrip('_')}({args[0] if args else ''})")
+
+    def execute(self):
+        bytes_ultima_respuesta()
+        inicio = time.perf_counter()
+        respuesta, error, intentos = None, None, 1
+        lectura = self._operacion == "select" or (self._operacion == "rpc"
+                                                  and self._recurso in RPC_SOLO_LECTURA)
+        try:
+            respuesta, intentos = resiliencia.ejecutar(self._constructor.execute, lectura)
+            return respuesta
+        except Exception as e:
+            error = f"{type(e).__name__}: {getattr(e, 'code', None) or e}"
+            intentos = getattr(e, 'intentos', intentos)
+            raise
+        finally:
+            datos = respuesta.data if respuesta is not None else None
+            tamano = bytes_ultima_respuesta()
+            if tamano is None:
+                # Backend sin HTTP: tamaño del JSON equivalente
+                tamano = len(json.dumps(datos, default=str).encode()) if datos else 0
+            self._registro.registrar({
+                "recurso": self._recurso,
+                "operacion": self._operacion,
+                "filtros": self._filtros,
+                "milisegundos": round((time.perf_counter() - inicio) * 1000, 2),
+                "filas": len(datos) if isinstance(datos, list) else 0,
+                "bytes": tamano,
+                "intentos": intentos,
+                "error": error,
+            })
+
+class ClienteInstrumentado:
+    """Cliente de datos cuyas consultas table()/rpc() quedan registradas"""
+    def __init__(self, cliente, registro):
+        self._cliente = cliente
+        self.registro = registro
+
+    def table(self, tabla):
+        return ConsultaInstrumentada(self._cliente.table(tabla), self.registro, tabla, "select")
+
+    def from_(self, tabla):
+        return self.table(tabla)
+
+    def rpc(self, funcion, parametros=None):
+        return ConsultaInstrumentada(self._cliente.rpc(funcion, parametros or {}),
+                                     self.registro, funcion, "rpc")
+
+    def __getattr__(self, nombre):
+        return getattr(self._cliente, nombre)
+
+def reportar(registro, pagina):
+    """Registra en el log el resumen del rerun y avisa si superó el presupuesto de consultas"""
+    totales = registro.totales()
+    resumen = json.dumps({"evento": "rerun", "pagina": pagina, **totales}, ensure_ascii=False)
+    if registro.excede_presupuesto():
+        logger.warning(f"{resumen} supera el presupuesto de {PRESUPUESTO_CONSULTAS} consultas")
+    else:
+        logger.info(resumen)
+    return totales
@@ -0,0 +1,553 @@
+import heapq
+import json
+import operator
+import random
+import re
+import threading
+import unicodedata
+import uuid
+from datetime import datetime, timedelta, timezone
+from postgrest.base_request_builder import APIResponse
+from postgrest.exceptions import APIError
+
+# Esquema de config.init_database: valores por defecto, columnas UNIQUE y claves foráneas
+ESQUEMA = {
+    "users": {
+        "defectos": {"role": "estudiante"},
+        "unicas": ("email", "dni"),
+        "fechas": ("created_at",),
+    },
+    "ofertas_practicas": {
+        "defectos": {"estado": "activa"},
+        "unicas": (),
+        "fechas": ("created_at", "updated_at"),
+    },
+    "postulaciones": {
+        "defectos": {"estado": "pendiente", "archivo_cv": None, "notas": None},
+        "unicas": (),
+        "fechas": ("fecha_postulacion", "updated_at"),
+    },
+    "eliminaciones": {
+        "defectos": {},
+        "unicas": (),
+        "fechas": ("eliminado_en",),
+    },
+}
+
+# (tabla, recurso embebido) -> columna con la clave foránea
+RELACIONES = {
+    ("postulaciones", "users"): "user_id",
+    ("postulaciones", "ofertas_practicas"): "oferta_id",
+}
+
+# Pesos de la columna generada busqueda (setweight A/B/C)
+CAMPOS_BUSQUEDA = (
+    (1.0, ("titulo",)),
+    (0.4, ("empresa", "area", "ubicacion")),
+    (0.2, ("requisitos", "descripcion")),
+)
+
+# Columnas TIMESTAMPTZ (el resto de fechas son TIMESTAMP sin zona, como en Postgres)
+_CON_ZONA = {"updated_at", "eliminado_en"}
+
+def _ahora(columna):
+    ahora = datetime.now(timezone.utc)
+    return ahora.isoformat() if columna in _CON_ZONA else ahora.replace(tzinfo=None).isoformat()
+
+def _error(codigo, mensaje, detalles=None):
+    return APIError({"code": codigo, "message": mensaje, "details": detalles, "hint": None})
+
+def _sin_acentos(texto):
+    """Equivalente a unaccent + lower"""
+    normalizado = unicodedata.normalize("NFKD", texto or "")
+    return "".join(c for c in normalizado if not unicodedata.combining(c)).lower()
+
+def _dividir(texto):
+    """Separa por comas de primer nivel (fuera de paréntesis y comillas)"""
+    partes, actual, nivel, comillas = [], "", 0, False
+    for c in texto:
+        if c == '"':
+            comillas = not comillas
+        elif not comillas and c == "(":
+            nivel += 1
+        elif not comillas and c == ")":
+            nivel -= 1
+        elif not comillas and nivel == 0 and c == ",":
+            partes.append(actual.strip())
+            actual = ""
+            continue
+        actual += c
+    if actual.strip():
+        partes.append(actual.strip())
+    return partes
+
+def _valor(texto):
+    return texto[1:-1] if texto.startswith('"') and texto.endswith('"') else texto
+
+def _comparar(operador, valor, referencia):
+    if operador == "in":
+        return valor in referencia
+    if operador == "is":
+        return valor is referencia
+    if valor is None:
+        return False
+    if operador in ("eq", "neq"):
+        igual = str(valor) == str(referencia) if isinstance(referencia, str) else valor == referencia
+        return igual if operador == "eq" else not igual
+    if isinstance(referencia, str) and not isinstance(valor, str):
+        valor = str(valor)
+    return {"gt": valor > referencia, "gte": valor >= referencia,
+            "lt": valor < referencia, "lte": valor <= referencia}[operador]
+
+def _patron_like(patron, operador):
+    """Expresión regular equivalente a un patrón LIKE/ILIKE (% y _, escapados con \\)"""
+    partes = re.findall(r"\\.|%|_|[^%_\\]+", patron.replace("*", "%"))
+    regex = "".join(".*" if p == "%" else "." if p == "_" else re.escape(p[-1] if p.startswith("\\") else p)
+                    for p in partes)
+    return re.compile(f"^{regex}$", re.S | (re.I if operador == "ilike" else 0))
+
+_OPERADORES = {"eq": operator.eq, "neq": operator.ne, "gt": operator.gt,
+               "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+def _predicado(columna, operador, referencia):
+    """Filtro de una columna como función fila -> bool"""
+    if operador in ("like", "ilike"):
+        patron = _patron_like(referencia, operador)
+        return lambda fila: (valor := fila.get(columna)) is not None and bool(patron.match(str(valor)))
+    comparar = _OPERADORES.get(operador)
+    if comparar and isinstance(referencia, str):
+        # Caso frecuente (textos, fechas ISO, uuid): sin pasar por _comparar
+        return lambda fila: (valor := fila.get(columna)) is not None and \
+            comparar(valor if isinstance(valor, str) else str(valor), referencia)
+    return lambda fila: _comparar(operador, fila.get(columna), referencia)
+
+def _expresion_or(texto):
+    """Convierte la sintaxis de or_ de PostgREST (a.op.v,and(b.op.v,...)) en un predicado"""
+    predicados = []
+    for parte in _dividir(texto):
+        grupo = re.match(r"^(and|or)\((.*)\)$", parte)
+        if grupo:
+            internos = [_expresion_or(sub) for sub in _dividir(grupo.group(2))]
+            combinar = all if grupo.group(1) == "and" else any
+            predicados.append(lambda fila, internos=internos, combinar=combinar:
+                              combinar(p(fila) for p in internos))
+        else:
+            columna, operador, valor = parte.split(".", 2)
+            predicados.append(_predicado(columna, operador, _valor(valor)))
+
+    if len(predicados) == 1:
+        return predicados[0]
+    return lambda fila: any(p(fila) for p in predicados)
+
+class ConsultaMemoria:
+    """Constructor de consultas con la misma interfaz fluida que postgrest-py"""
+    def __init__(self, cliente, tabla, funcion=None, parametros=None):
+        self.cliente = cliente
+        self.tabla = tabla
+        self.funcion = funcion
+        self.parametros = parametros or {}
+        self.operacion = "select" if funcion is None else "rpc"
+        self.columnas = "*"
+        self.conteo = None
+        self.datos = None
+        self.devolver = True
+        self.filtros = []
+        self.orden = []
+        self.desde = 0
+        self.hasta = None
+
+    # Operaciones
+    def select(self, *columnas, count=None):
+        self.columnas = ",".join(columnas) or "*"
+        self.conteo = count
+        return self
+
+    def insert(self, datos, count=None, returning="representation", upsert=False):
+        self.operacion, self.datos = "insert", datos
+        self.devolver = returning != "minimal"
+        return self
+
+    def update(self, datos, count=None, returning="representation"):
+        self.operacion, self.datos = "update", datos
+        self.devolver = returning != "minimal"
+        return self
+
+    def delete(self, count=None, returning="representation"):
+        self.operacion = "delete"
+        self.devolver = returning != "minimal"
+        return self
+
+    # Filtros
+    def _filtro(self, columna, operador, valor):
+        self.filtros.append((columna, operador, valor))
+        return self
+
+    def eq(self, columna, valor):
+        return self._filtro(columna, "eq", valor)
+
+    def neq(self, columna, valor):
+        return self._filtro(columna, "neq", valor)
+
+    def gt(self, columna, valor):
+        return self._filtro(columna, "gt", valor)
+
+    def gte(self, columna, valor):
+        return self._filtro(columna, "gte", valor)
+
+    def lt(self, columna, valor):
+        return self._filtro(columna, "lt", valor)
+
+    def lte(self, columna, valor):
+        return self._filtro(columna, "lte", valor)
+
+    def like(self, columna, patron):
+        return self._filtro(columna, "like", patron)
+
+    def ilike(self, columna, patron):
+        return self._filtro(columna, "ilike", patron)
+
+    def in_(self, columna, valores):
+        return self._filtro(columna, "in", set(valores))
+
+    def is_(self, columna, valor):
+        return self._filtro(columna, "is", None if valor in ("null", None) else valor)
+
+    def or_(self, expresion):
+        self.filtros.append((None, "or", _expresion_or(expresion)))
+        return self
+
+    # Modificadores
+    def order(self, columna, desc=False, nullsfirst=False):
+        self.orden.append((columna, desc))
+        return self
+
+    def limit(self, cantidad):
+        self.hasta = self.desde + cantidad - 1
+        return self
+
+    def range(self, inicio, fin):
+        self.desde, self.hasta = inicio, fin
+        return self
+
+    def execute(self):
+        with self.cliente.lock:
+            conteo = None
+            if self.operacion == "insert":
+                filas = self.cliente._insertar(self.tabla, self.datos)
+            else:
+                filas, conteo = self._seleccionar()
+                if self.operacion == "update":
+                    filas = self.cliente._actualizar(self.tabla, [fila['id'] for fila in filas], self.datos)
+                elif self.operacion == "delete":
+                    filas = self.cliente._eliminar(self.tabla, [fila['id'] for fila in filas])
+            filas = filas if self.devolver else []
+            self.cliente._contabilizar(filas)
+            return APIResponse(data=filas, count=conteo)
+
+    def _seleccionar(self):
+        if self.operacion == "rpc":
+            filas = self.cliente._rpc(self.funcion, self.parametros)
+        else:
+            filas = self.cliente._origen(self.tabla)
+        columnas, embebidos = self._proyeccion()
+
+        # Primero los filtros sobre columnas propias; los recursos embebidos solo se
+        # resuelven antes de paginar si filtran filas (!inner o filtros "recurso.columna")
+        predicados = [valor if operador == "or" else _predicado(columna, operador, valor)
+                      for columna, operador, valor in self.filtros
+                      if operador == "or" or "." not in columna]
+        resultado = [fila for fila in filas if all(p(fila) for p in predicados)]
+        filtran = {nombre for nombre, (_, interno) in embebidos.items()
+                   if interno or any(col and col.startswith(nombre + ".") for col, _, _ in self.filtros)}
+        if filtran:
+            resultado = self._embeber(resultado, {n: e for n, e in embebidos.items() if n in filtran})
+
+        conteo = len(resultado) if self.conteo else None
+        resultado = self._ordenar(resultado)[self.desde:None if self.hasta is None else self.hasta + 1]
+        resultado = self._embeber(resultado, {n: e for n, e in embebidos.items() if n not in filtran})
+
+        if "*" not in columnas and self.operacion in ("select", "rpc"):
+            return [{k: v for k, v in fila.items() if k in columnas or k in embebidos}
+                    for fila in resultado], conteo
+        return [dict(fila) for fila in resultado], conteo
+
+    def _ordenar(self, filas):
+        """Aplica order(); con limit y un solo sentido basta un heap en vez de ordenar todo"""
+        if not self.orden:
+            return filas
+        sentidos = {desc for _, desc in self.orden}
+        if self.hasta is not None and len(sentidos) == 1:
+            elegir = heapq.nlargest if sentidos.pop() else heapq.nsmallest
+            try:
+                return elegir(self.hasta + 1, filas, key=operator.itemgetter(*(c for c, _ in self.orden)))
+            except (KeyError, TypeError):
+                pass  # columnas ausentes o NULL: orden general
+        for columna, desc in reversed(self.orden):
+            filas.sort(key=lambda fila: (fila.get(columna) is None, fila.get(columna)), reverse=desc)
+        return filas
+
+    def _embeber(self, filas, embebidos):
+        """Agrega los recursos relacionados a cada fila; descarta las que no cumplen un !inner"""
+        if not embebidos:
+            return filas
+        resultado = []
+        for fila in filas:
+            completa = dict(fila)
+            descartar = False
+            for nombre, (sub_columnas, interno) in embebidos.items():
+                relacionada = self.cliente._relacionada(self.tabla, nombre, fila)
+                filtros = [(col.split(".", 1)[1], op, val) for col, op, val in self.filtros
+                           if col and col.startswith(nombre + ".")]
+                if relacionada is not None and not all(_comparar(op, relacionada.get(col), val)
+                                                       for col, op, val in filtros):
+                    relacionada = None
+                if relacionada is None and interno:
+                    descartar = True
+                completa[nombre] = relacionada and {k: v for k, v in relacionada.items()
+                                                    if sub_columnas == ["*"] or k in sub_columnas}
+            if not descartar:
+                resultado.append(completa)
+        return resultado
+
+    def _proyeccion(self):
+        """Columnas simples y recursos embebidos ("tabla!inner(col, ...)") del select"""
+        columnas, embebidos = [], {}
+        for parte in _dividir(self.columnas):
+            embebido = re.match(r"^(\w+)(!inner)?\((.*)\)$", parte)
+            if embebido:
+                sub_columnas = [c.strip() for c in embebido.group(3).split(",")]
+                embebidos[embebido.group(1)] = (sub_columnas, bool(embebido.group(2)))
+            else:
+                columnas.append(parte)
+        return columnas, embebidos
+
+class ClienteMemoria:
+    """Backend en memoria que imita el esquema de config.init_database, sin red ni Supabase"""
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.tablas = {tabla: {} for tabla in ESQUEMA}
+        # Índices UNIQUE: (tabla, columna) -> {valor: id}
+        self.unicos = {(tabla, columna): {} for tabla, esquema in ESQUEMA.items()
+                       for columna in esquema["unicas"]}
+        self.metricas = {"consultas": 0, "filas": 0, "bytes": 0}
+        # Equivalente a la columna generada busqueda: texto normalizado por peso
+        self.busqueda = {}
+
+    def table(self, tabla):
+        return ConsultaMemoria(self, tabla)
+
+    def from_(self, tabla):
+        return self.table(tabla)
+
+    def rpc(self, funcion, parametros=None):
+        return ConsultaMemoria(self, None, funcion, parametros)
+
+    # Tablas y vistas
+    def _origen(self, tabla):
+        vistas = {
+            "resumen_postulaciones_oferta": self._resumen_postulaciones_oferta,
+            "postulaciones_por_semana": self._postulaciones_por_semana,
+        }
+        if tabla in vistas:
+            return vistas[tabla]()
+        if tabla not in self.tablas:
+            raise _error("42P01", f'relation "public.{tabla}" does not exist')
+        return list(self.tablas[tabla].values())
+
+    def _relacionada(self, tabla, recurso, fila):
+        columna = RELACIONES.get((tabla, recurso))
+        if columna is None:
+            raise _error("PGRST200", f"Could not find a relationship between '{tabla}' and '{recurso}'")
+        return self.tablas[recurso].get(fila.get(columna))
+
+    def _insertar(self, tabla, datos):
+        esquema = ESQUEMA[tabla]
+        nuevas = []
+        try:
+            for datos_fila in datos if isinstance(datos, list) else [datos]:
+                fila = {"id": str(uuid.uuid4()), **esquema["defectos"],
+                        **{columna: _ahora(columna) for columna in esquema["fechas"]}, **datos_fila}
+                self._validar(tabla, fila)
+                self._guardar(tabla, fila)
+                nuevas.append(fila)
+        except APIError:
+            # Una sentencia es atómica: si una fila falla no se inserta ninguna
+            for fila in nuevas:
+                self._quitar(tabla, fila['id'])
+            raise
+        return [dict(fila) for fila in nuevas]
+
+    def _actualizar(self, tabla, ids, datos):
+        originales, actualizadas = [], []
+        try:
+            for fila_id in ids:
+                original = self._quitar(tabla, fila_id)
+                originales.append(original)
+                fila = {**original, **datos}
+                if "updated_at" in ESQUEMA[tabla]["fechas"]:
+                    fila["updated_at"] = _ahora("updated_at")
+                self._validar(tabla, fila)
+                self._guardar(tabla, fila)
+                actualizadas.append(fila)
+        except APIError:
+            for fila in actualizadas:
+                self._quitar(tabla, fila['id'])
+            for fila in originales:
+                self._guardar(tabla, fila)
+            raise
+        return [dict(fila) for fila in actualizadas]
+
+    def _eliminar(self, tabla, ids):
+        ids = set(ids)
+        for (origen, destino), columna in RELACIONES.items():
+            if destino == tabla and any(fila.get(columna) in ids for fila in self.tablas[origen].values()):
+                raise _error("23503", f'update or delete on table "{tabla}" violates foreign key '
+                                      f'constraint "{origen}_{columna}_fkey" on table "{origen}"')
+        eliminadas = [self._quitar(tabla, fila_id) for fila_id in ids]
+        if tabla == "postulaciones":
+            self._insertar("eliminaciones", [{"tabla": tabla, "fila_id": fila['id']} for fila in eliminadas])
+        return eliminadas
+
+    def _guardar(self, tabla, fila):
+        self.tablas[tabla][fila['id']] = fila
+        for columna in ESQUEMA[tabla]["unicas"]:
+            if fila.get(columna) is not None:
+                self.unicos[(tabla, columna)][fila[columna]] = fila['id']
+        if tabla == "ofertas_practicas":
+            # Columna generada de config.init_database
+            fila["ubicacion_normalizada"] = _sin_acentos(fila.get("ubicacion"))
+            self.busqueda[fila['id']] = [(peso, " ".join(_sin_acentos(fila.get(c)) for c in columnas))
+                                         for peso, columnas in CAMPOS_BUSQUEDA]
+
+    def _quitar(self, tabla, fila_id):
+        fila = self.tablas[tabla].pop(fila_id)
+        for columna in ESQUEMA[tabla]["unicas"]:
+            self.unicos[(tabla, columna)].pop(fila.get(columna), None)
+        self.busqueda.pop(fila_id, None)
+        return fila
+
+    def _contabilizar(self, filas):
+        """Consultas, filas y bytes JSON que habría transferido PostgREST"""
+        self.metricas["consultas"] += 1
+        self.metricas["filas"] += len(filas)
+        self.metricas["bytes"] += len(json.dumps(filas, default=str).encode())
+
+    def _validar(self, tabla, fila):
+        """Restricciones UNIQUE y de clave foránea, con los mismos códigos que Postgres"""
+        for columna in ESQUEMA[tabla]["unicas"]:
+            valor = fila.get(columna)
+            if valor is not None and self.unicos[(tabla, columna)].get(valor, fila['id']) != fila['id']:
+                raise _error("23505", f'duplicate key value violates unique constraint "{tabla}_{columna}_key"',
+                             f"Key ({columna})=({valor}) already exists.")
+        for (origen, destino), columna in RELACIONES.items():
+            if origen == tabla and fila.get(columna) is not None and fila[columna] not in self.tablas[destino]:
+                raise _error("23503", f'insert or update on table "{tabla}" violates foreign key '
+                                      f'constraint "{tabla}_{columna}_fkey"',
+                             f'Key ({columna})=({fila[columna]}) is not present in table "{destino}".')
+
+    # Vistas y funciones del esquema
+    def _resumen_postulaciones_oferta(self):
+        resumen = {oferta_id: {"oferta_id": oferta_id, "titulo": oferta['titulo'], "empresa": oferta['empresa'],
+                               "area": oferta['area'], "modalidad": oferta.get('modalidad'),
+                               "postulaciones": 0, "aprobadas": 0, "rechazadas": 0, "pendientes": 0}
+                   for oferta_id, oferta in self.tablas["ofertas_practicas"].items()}
+        contadores = {"aprobado": "aprobadas", "rechazado": "rechazadas", "pendiente": "pendientes"}
+        for postulacion in self.tablas["postulaciones"].values():
+            fila = resumen.get(postulacion['oferta_id'])
+            if fila:
+                fila["postulaciones"] += 1
+                if postulacion['estado'] in contadores:
+                    fila[contadores[postulacion['estado']]] += 1
+        return list(resumen.values())
+
+    def _postulaciones_por_semana(self):
+        semanas = {}
+        for postulacion in self.tablas["postulaciones"].values():
+            fecha = datetime.fromisoformat(postulacion['fecha_postulacion']).date()
+            semana = (fecha - timedelta(days=fecha.weekday())).isoformat()
+            semanas[semana] = semanas.get(semana, 0) + 1
+        return [{"semana": semana, "postulaciones": total} for semana, total in semanas.items()]
+
+    def _rpc(self, funcion, parametros):
+        if funcion == "estadisticas_admin":
+            postulaciones = self.tablas["postulaciones"].values()
+            return [{
+                "total_ofertas": len(self.tablas["ofertas_practicas"]),
+                "total_postulaciones": len(postulaciones),
+                "pendientes": sum(1 for p in postulaciones if p['estado'] == "pendiente"),
+            }]
+        if funcion == "buscar_ofertas":
+            return self._buscar_ofertas(parametros.get("texto", ""))
+        raise _error("PGRST202", f"Could not find the function public.{funcion}")
+
+    def _buscar_ofertas(self, texto):
+        """Aproxima websearch_to_tsquery + ts_rank: todos los términos, sin acentos, con pesos A/B/C"""
+        terminos = [t.strip('"') for t in _sin_acentos(texto).split() if t.lower() != "or" and not t.startswith("-")]
+        resultados = []
+        for oferta in self.tablas["ofertas_practicas"].values():
+            textos = self.busqueda[oferta['id']]
+            rango = 0.0
+            for termino in terminos:
+                aciertos = sum(peso for peso, contenido in textos if termino in contenido)
+                if not aciertos:
+                    break
+                rango += aciertos
+            else:
+                if terminos:
+                    fila = {k: v for k, v in oferta.items() if k not in ("requisitos", "descripcion", "updated_at")}
+                    resultados.append({**fila, "rango": rango})
+        return resultados
+
+_DEMO_PASSWORD = "demo1234"
+
+def sembrar(cliente, ofertas=50, postulaciones=200, estudiantes=None, semilla=0):
+    """Carga datos sintéticos reproducibles: un admin, estudiantes, ofertas y postulaciones"""
+    from hashing import hashear_password
+    from database import ESTADOS_OFERTA
+
+    azar = random.Random(semilla)
+    estudiantes = estudiantes or max(1, postulaciones // 5)
+    password_hash = hashear_password(_DEMO_PASSWORD)
+    areas = ["Tecnología", "Marketing", "Finanzas", "Recursos Humanos", "Ingeniería", "Diseño"]
+    empresas = [f"Empresa {n}" for n in range(1, max(2, ofertas // 5) + 1)]
+    inicio = datetime.now() - timedelta(days=180)
+
+    cliente.table("users").insert([{"email": "admin@demo.local", "password_hash": password_hash, "role": "admin",
+                                    "nombre": "Admin", "apellido": "Demo", "dni": "00000000"}]).execute()
+    usuarios = cliente.table("users").insert([
+        {"email": f"estudiante{n}@demo.local", "password_hash": password_hash, "nombre": f"Estudiante{n}",
+         "apellido": "Demo", "dni": f"{10000000 + n}", "carrera": azar.choice(areas), "universidad": "Demo"}
+        for n in range(estudiantes)
+    ]).execute().data
+
+    filas_ofertas = []
+    for n in range(ofertas):
+        creada = (inicio + timedelta(minutes=azar.randrange(180 * 24 * 60))).isoformat()
+        filas_ofertas.append({
+            "titulo": f"Práctica de {azar.choice(areas)} {n}", "empresa": azar.choice(empresas),
+            "area": azar.choice(areas), "duracion": azar.choice(["3 meses", "6 meses", "12 meses"]),
+            "modalidad": azar.choice(["Presencial", "Remoto", "Híbrido"]), "ubicacion": "Lima",
+            "requisitos": "Estudiante de últimos ciclos", "descripcion": "Apoyo al equipo " * 20,
+            "estado": azar.choice(ESTADOS_OFERTA[:1] * 3 + ESTADOS_OFERTA[1:]), "created_at": creada,
+        })
+    ids_ofertas = [fila['id'] for fila in cliente.table("ofertas_practicas").insert(filas_ofertas).execute().data]
+
+    if ids_ofertas:
+        cliente.table("postulaciones").insert([{
+            "user_id": azar.choice(usuarios)['id'], "oferta_id": azar.choice(ids_ofertas),
+            "estado": azar.choice(["pendiente", "pendiente", "aprobado", "rechazado"]),
+            "fecha_postulacion": (inicio + timedelta(minutes=azar.randrange(180 * 24 * 60))).isoformat(),
+        } for _ in range(postulaciones)]).execute()
+    return cliente
+
+_cliente = None
+_cliente_lock = threading.Lock()
+
+def cliente_memoria():
+    """Cliente en memoria compartido por el proceso, sembrado con MEMORIA_OFERTAS/MEMORIA_POSTULACIONES"""
+    global _cliente
+    with _cliente_lock:
+        if _cliente is None:
+            from config import MEMORIA_OFERTAS, MEMORIA_POSTULACIONES
+            _cliente = sembrar(ClienteMemoria(), MEMORIA_OFERTAS, MEMORIA_POSTULACIONES)
+    return _cliente
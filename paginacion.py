@@ -0,0 +1,25 @@
+import streamlit as st
+
+def cursor_actual(clave, firma=None):
+    """Retorna el cursor de la página visible; vuelve a la primera si cambian los filtros"""
+    estado = st.session_state.get(f"pag_{clave}")
+    if estado is None or estado['firma'] != firma:
+        estado = {"firma": firma, "cursores": [None]}
+        st.session_state[f"pag_{clave}"] = estado
+    return estado['cursores'][-1]
+
+def controles_paginacion(clave, siguiente):
+    """Botones Anterior/Siguiente que recorren las páginas guardadas en session_state"""
+    cursores = st.session_state[f"pag_{clave}"]['cursores']
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if len(cursores) > 1 and st.button("⬅️ Anterior", key=f"{clave}_anterior"):
+            cursores.pop()
+            st.rerun()
+    with col2:
+        st.markdown(f"<p style='text-align: center;'>Página {len(cursores)}</p>", unsafe_allow_html=True)
+    with col3:
+        if siguiente and st.button("Siguiente ➡️", key=f"{clave}_siguiente"):
+            cursores.append(siguiente)
+            st.rerun()
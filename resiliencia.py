@@ -0,0 +1,110 @@
+import random
+import sys
+import threading
+import time
+from config import (REINTENTOS_LECTURA, REINTENTO_BASE, REINTENTO_MAX,
+                    CIRCUITO_FALLOS, CIRCUITO_ESPERA)
+
+# Códigos de Postgres/PostgREST (y HTTP de la pasarela) que indican un problema pasajero
+_CODIGOS_TRANSITORIOS = {
+    "57014",  # statement_timeout
+    "40001", "40P01",  # serialización / deadlock
+    "53300",  # demasiadas conexiones
+    "57P01", "57P03",  # servidor reiniciando o no disponible
+    "PGRST000", "PGRST001", "PGRST002", "PGRST003",  # PostgREST sin conexión a la base
+    "502", "503", "504",
+}
+
+class BackendNoDisponible(Exception):
+    """El circuito está abierto: se falla de inmediato sin llamar al backend"""
+    def __init__(self, reintentar_en):
+        super().__init__(f"Servicio de datos no disponible, reintenta en {reintentar_en} s")
+        self.reintentar_en = reintentar_en
+
+def es_transitorio(error):
+    """True si el error es de red, timeout o sobrecarga (reintentar puede funcionar)"""
+    codigo = getattr(error, 'code', None)
+    if codigo is not None and str(codigo) in _CODIGOS_TRANSITORIOS:
+        return True
+    # Si httpx no está cargado (backend en memoria) el error no puede ser de red
+    httpx = sys.modules.get("httpx")
+    return httpx is not None and isinstance(error, httpx.TransportError)
+
+class Circuito:
+    """Circuit breaker: tras `umbral` fallos transitorios seguidos, rechaza llamadas durante `espera` segundos"""
+    def __init__(self, umbral=CIRCUITO_FALLOS, espera=CIRCUITO_ESPERA):
+        self.umbral = umbral
+        self.espera = espera
+        self.fallos = 0
+        self.abierto_desde = None
+        self.sondeando = False
+        self.rechazadas = 0
+        self._lock = threading.Lock()
+
+    def permitir(self):
+        """Lanza BackendNoDisponible si el circuito está abierto; pasada la espera deja pasar una sonda"""
+        with self._lock:
+            if self.abierto_desde is None:
+                return
+            restante = self.espera - (time.monotonic() - self.abierto_desde)
+            if restante <= 0 and not self.sondeando:
+                self.sondeando = True
+                return
+            self.rechazadas += 1
+            raise BackendNoDisponible(max(1, round(restante)))
+
+    def exito(self):
+        with self._lock:
+            self.fallos = 0
+            self.abierto_desde = None
+            self.sondeando = False
+
+    def fallo(self):
+        with self._lock:
+            self.fallos += 1
+            if self.sondeando or self.fallos >= self.umbral:
+                self.abierto_desde = time.monotonic()
+            self.sondeando = False
+
+    def estado(self):
+        with self._lock:
+            if self.abierto_desde is None:
+                nombre = "cerrado"
+            elif self.sondeando:
+                nombre = "semiabierto"
+            else:
+                nombre = "abierto"
+            return {"estado": nombre, "fallos_seguidos": self.fallos, "rechazadas": self.rechazadas}
+
+# Compartido por todo el proceso: si el backend cae, todas las sesiones dejan de esperarlo
+circuito = Circuito()
+
+def ejecutar(llamada, lectura):
+    """Ejecuta la llamada protegida por el circuito; las lecturas se reintentan con backoff y jitter.
+
+    Retorna (resultado, intentos). Si falla, la excepción lleva los intentos hechos en `intentos`.
+    """
+    intento = 0
+    while True:
+        try:
+            circuito.permitir()
+        except BackendNoDisponible as e:
+            e.intentos = intento
+            raise
+        intento += 1
+        try:
+            resultado = llamada()
+        except Exception as e:
+            e.intentos = intento
+            if not es_transitorio(e):
+                # El backend respondió (p. ej. una violación UNIQUE): cuenta como disponible
+                circuito.exito()
+                raise
+            circuito.fallo()
+            if not lectura or intento > REINTENTOS_LECTURA:
+                raise
+            # Backoff exponencial con jitter completo
+            time.sleep(random.uniform(0, min(REINTENTO_MAX, REINTENTO_BASE * 2 ** (intento - 1))))
+            continue
+        circuito.exito()
+        return resultado, intento
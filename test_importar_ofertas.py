@@ -0,0 +1,49 @@
+import io
+import pytest
+from postgrest.exceptions import APIError
+from importar_ofertas import importar_ofertas, leer_bloques, validar_fila
+
+CSV = "titulo,empresa,area,duracion,modalidad\nA,E,Tecnología,6,\nB,E,Tecnología,,Remoto\n"
+JSONL = ('{"titulo": "A", "empresa": "E", "area": "Tecnología", "duracion": 6}\n'
+         '{"titulo": "B", "empresa": "E", "area": "Tecnología", "modalidad": "Remoto"}\n')
+JSON = ('[{"titulo": "A", "empresa": "E", "area": "Tecnología", "duracion": 6},'
+        ' {"titulo": "B", "empresa": "E", "area": "Tecnología", "modalidad": "Remoto"}]')
+
+@pytest.mark.parametrize("formato, contenido", [("csv", CSV), ("jsonl", JSONL), ("json", JSON)])
+def test_claves_opcionales_ausentes(formato, contenido):
+    filas = [fila for bloque in leer_bloques(io.StringIO(contenido), formato, 1)
+             for fila in bloque.to_dict("records")]
+    resultados = [validar_fila(fila) for fila in filas]
+
+    assert [error for _, error in resultados] == [None, None]
+    primera, segunda = (datos for datos, _ in resultados)
+    assert primera == {"titulo": "A", "empresa": "E", "area": "Tecnología", "duracion": "6", "estado": "activa"}
+    assert segunda == {"titulo": "B", "empresa": "E", "area": "Tecnología", "modalidad": "Remoto",
+                       "estado": "activa"}
+
+class BaseConfirmaSinResponder:
+    """Confirma la inserción del segundo lote pero la respuesta no llega (timeout)"""
+    def __init__(self):
+        self.ofertas = []
+        self.lotes = 0
+
+    def crear_ofertas(self, lista_datos):
+        self.ofertas.extend(lista_datos)
+        self.lotes += 1
+        if self.lotes == 2:
+            raise APIError({"code": "57014", "message": "canceling statement due to statement timeout"})
+
+    def claves_ofertas(self, titulos):
+        return [(o["titulo"], o["empresa"], o["area"]) for o in self.ofertas if o["titulo"] in titulos]
+
+def test_reanudar_no_duplica_el_lote_confirmado():
+    contenido = "titulo,empresa,area\n" + "".join(f"T{i},E,Tecnología\n" for i in range(5))
+    db = BaseConfirmaSinResponder()
+
+    resumen = importar_ofertas(db, io.StringIO(contenido), "csv", tamano_lote=2)
+    assert not resumen.completa and resumen.siguiente_fila == 2
+
+    resumen = importar_ofertas(db, io.StringIO(contenido), "csv", tamano_lote=2, desde=resumen.siguiente_fila)
+    assert resumen.completa
+    assert (resumen.insertadas, resumen.omitidas) == (1, 2)
+    assert sorted(o["titulo"] for o in db.ofertas) == [f"T{i}" for i in range(5)]
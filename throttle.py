@@ -0,0 +1,117 @@
+import threading
+import time
+from collections import deque
+from cache import CacheTTL
+from config import (LOGIN_MAX_INTENTOS_EMAIL, LOGIN_MAX_INTENTOS_SESION,
+                    LOGIN_VENTANA, LOGIN_INEXISTENTES_TTL)
+
+class LimitadorVentana:
+    """Limitador de ventana deslizante: como máximo N intentos por clave en los últimos S segundos"""
+    def __init__(self, max_intentos, ventana):
+        self.max_intentos = max_intentos
+        self.ventana = ventana
+        self._intentos = {}
+        self._lock = threading.Lock()
+        self._llamadas = 0
+
+    def permitir(self, clave):
+        """Registra un intento y retorna False si la clave superó el límite"""
+        ahora = time.monotonic()
+        with self._lock:
+            self._llamadas += 1
+            if self._llamadas % 1000 == 0:
+                self._limpiar(ahora)
+            
+            marcas = self._intentos.setdefault(clave, deque())
+            while marcas and marcas[0] <= ahora - self.ventana:
+                marcas.popleft()
+            if len(marcas) >= self.max_intentos:
+                return False
+            marcas.append(ahora)
+            return True
+
+    def reintentar_en(self, clave):
+        """Segundos hasta que la clave vuelva a tener un intento disponible"""
+        with self._lock:
+            marcas = self._intentos.get(clave)
+            if not marcas:
+                return 0
+            return max(0, int(marcas[0] + self.ventana - time.monotonic()) + 1)
+
+    def reiniciar(self, clave):
+        """Olvida los intentos de una clave"""
+        with self._lock:
+            self._intentos.pop(clave, None)
+
+    def _limpiar(self, ahora):
+        """Descarta claves sin intentos dentro de la ventana (requiere el lock)"""
+        vencidas = [clave for clave, marcas in self._intentos.items()
+                    if not marcas or marcas[-1] <= ahora - self.ventana]
+        for clave in vencidas:
+            del self._intentos[clave]
+
+limitador_email = LimitadorVentana(LOGIN_MAX_INTENTOS_EMAIL, LOGIN_VENTANA)
+limitador_sesion = LimitadorVentana(LOGIN_MAX_INTENTOS_SESION, LOGIN_VENTANA)
+
+# Emails que no existen: se responden sin consultar la base ni ejecutar bcrypt
+emails_inexistentes = CacheTTL(ttl=LOGIN_INEXISTENTES_TTL, max_entradas=10000)
+
+_lock = threading.Lock()
+_contadores = {
+    "intentos": 0,
+    "rechazados_email": 0,
+    "rechazados_sesion": 0,
+    "inexistentes_cache": 0,
+    "bcrypt_ejecutados": 0
+}
+
+def _contar(clave):
+    with _lock:
+        _contadores[clave] += 1
+
+def normalizar_email(email):
+    """Forma canónica del email: la misma para buscar, registrar y como clave de los límites"""
+    return (email or "").strip().lower()
+
+def verificar_intento(email, sesion_id):
+    """Registra un intento de login; retorna los segundos de espera si debe rechazarse, o 0"""
+    email = normalizar_email(email)
+    _contar("intentos")
+    
+    if not limitador_sesion.permitir(sesion_id):
+        _contar("rechazados_sesion")
+        return limitador_sesion.reintentar_en(sesion_id)
+    if not limitador_email.permitir(email):
+        _contar("rechazados_email")
+        return limitador_email.reintentar_en(email)
+    return 0
+
+def es_email_inexistente(email):
+    """True si el email se buscó hace poco y no existía"""
+    if emails_inexistentes.consultar(normalizar_email(email)):
+        _contar("inexistentes_cache")
+        return True
+    return False
+
+def marcar_inexistente(email):
+    emails_inexistentes.guardar(normalizar_email(email), True)
+
+def olvidar_inexistente(email):
+    """Se llama al registrar un usuario para que pueda iniciar sesión de inmediato"""
+    emails_inexistentes.invalidar(normalizar_email(email))
+
+def registrar_bcrypt():
+    _contar("bcrypt_ejecutados")
+
+def login_exitoso(email):
+    """Un login correcto libera el límite de ese email"""
+    limitador_email.reiniciar(normalizar_email(email))
+
+def metricas_login():
+    """Contadores de intentos, rechazos y trabajo bcrypt evitado"""
+    with _lock:
+        contadores = dict(_contadores)
+    contadores["bcrypt_evitados"] = (contadores["rechazados_email"] +
+                                     contadores["rechazados_sesion"] +
+                                     contadores["inexistentes_cache"])
+    return contadores